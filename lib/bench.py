@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import random
+import statistics
+import collections
+import concurrent.futures
+
+from lib.solver import Solver
+from lib.wordle import Wordle
+from lib.responses import digest
+
+MAX_ROUNDS = 6 # more than this and we lost
+
+# the solver of a worker process, workers forked after the parent created
+# its solver inherit it (and its response matrix) instead of building one
+_solver = None
+
+def init_worker(args):
+    global _solver
+
+    if _solver is None:
+        _solver = Solver(args)
+
+def solve_word(word, guesses=()):
+    """
+    solve word from scratch with the worker's solver,
+    return (word, rounds, decision cache hits, misses)
+    """
+    decisions = _solver.decisions
+    hits, misses = decisions.hits, decisions.misses
+
+    _solver.reset()
+    rounds = _solver.solve(word, list(guesses))
+
+    return word, rounds, decisions.hits - hits, decisions.misses - misses
+
+def evaluate_opener(opener, answers, bound=None):
+    """
+    solve every answer starting with opener, return (opener, mean rounds,
+    worst rounds, answers solved). gives up with a mean of None as soon as
+    the mean can't be lower than bound
+    """
+    total = worst = 0
+    floor = OpenerFloor(_solver.wordle, opener, answers)
+
+    for i, word in enumerate(answers):
+        _solver.reset()
+        rounds = _solver.solve(word, [opener])
+        total += rounds
+        worst = max(worst, rounds)
+
+        floor.solved(word, rounds)
+        if bound is not None and (total + floor.rounds) / len(answers) > bound:
+            return opener, None, worst, i + 1
+
+    return opener, total / len(answers), worst, len(answers)
+
+
+class OpenerFloor:
+    """
+    lower bound on the rounds the answers not solved yet take after opener
+
+    the opener's response splits the answers in buckets, the opener itself
+    takes 1 round and of every other bucket at most one answer can be the
+    second guess, the rest take at least 3 rounds
+    """
+
+    def __init__(self, wordle, opener, answers):
+        self.found   = Wordle.encode(Wordle.LETTER_EXACT * wordle.wordlen)
+        self.buckets = {word: code for code, words in wordle.partition(opener, answers).items() for word in words}
+        self.left    = collections.Counter(self.buckets.values())
+        self.paired  = set() # buckets whose answer found in 2 rounds was solved
+        self.rounds  = sum(self.bucket_floor(code) for code in self.left)
+
+    def bucket_floor(self, code):
+        left = self.left[code]
+
+        if code == self.found:
+            return left
+        if code in self.paired or not left:
+            return 3 * left
+        return 3 * left - 1
+
+    def solved(self, word, rounds):
+        code = self.buckets[word]
+        self.rounds -= self.bucket_floor(code)
+
+        self.left[code] -= 1
+        if rounds == 2:
+            self.paired.add(code)
+
+        self.rounds += self.bucket_floor(code)
+
+class Bench:
+    """
+    solve many words across a process pool and collect the number of rounds each took
+    """
+
+    def __init__(self, args, workers=None, solver=None):
+        global _solver
+
+        self.args    = args
+        self.workers = workers or os.cpu_count()
+        self.solver  = _solver = solver or Solver(args)
+
+    def words(self, sample=None):
+        """
+        every dictionary word or a random sample of them
+        """
+        words = list(self.solver.wordle.dictionary)
+
+        if sample and sample < len(words):
+            words = random.sample(words, sample)
+
+        return words
+
+    def run(self, words, guesses=(), callback=None):
+        """
+        solve words, forcing the given opening guesses, and return a BenchResult.
+        callback(word, rounds) is called as each word is solved
+        """
+        results = {}
+        hits = misses = 0
+        chunksize = max(1, len(words) // (self.workers * 8))
+        start = time.perf_counter()
+
+        with concurrent.futures.ProcessPoolExecutor(self.workers, initializer=init_worker, initargs=(self.args,)) as pool:
+            for word, rounds, _hits, _misses in pool.map(solve_word, words, [guesses] * len(words), chunksize=chunksize):
+                results[word] = rounds
+                hits += _hits
+                misses += _misses
+
+                if callback:
+                    callback(word, rounds)
+
+        return BenchResult(results, time.perf_counter() - start, hits, misses)
+
+
+class BenchResult:
+    """
+    summary of a Bench.run
+    """
+
+    def __init__(self, results, elapsed, hits=0, misses=0):
+        self.results = results
+        self.elapsed = elapsed
+        self.hits    = hits   # decision cache
+        self.misses  = misses
+
+    @property
+    def histogram(self):
+        return collections.Counter(self.results.values())
+
+    @property
+    def mean(self):
+        return statistics.mean(self.results.values())
+
+    @property
+    def failures(self):
+        return [word for word, rounds in self.results.items() if rounds > MAX_ROUNDS]
+
+    @property
+    def failure_rate(self):
+        return len(self.failures) / len(self.results)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    @property
+    def throughput(self):
+        return len(self.results) / self.elapsed
+
+
+class OpenerSearch:
+    """
+    find the opening guess with the lowest mean rounds over a set of answers
+
+    openers are evaluated in parallel, best scoring first so a good bound is
+    found early and hopeless openers are abandoned part way through. every
+    result is written to the checkpoint file so a search can be resumed.
+
+    the checkpoint records the dictionary, solver settings and answers, a
+    search can only be resumed with the same ones or the means aren't
+    comparable.
+    """
+
+    def __init__(self, bench, checkpoint=None):
+        self.bench      = bench
+        self.checkpoint = checkpoint
+        self.meta       = self.describe(bench.solver)
+        self.answers    = None # sorted, once known
+        self.results    = {} # opener: [mean or None if pruned, worst, answers solved]
+
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                data = json.load(f)
+
+            if data.get('meta') != self.meta:
+                raise ValueError(f"checkpoint {checkpoint} was made with a different dictionary or solver options")
+
+            self.answers = data['answers']
+            self.results = data['results']
+
+    @staticmethod
+    def describe(solver):
+        """
+        everything besides the answers that a checkpoint's results depend on
+        """
+        return {
+            'wordlen': solver.wordlen,
+            'digest': digest(solver.wordle.dictionary, solver.wordlen).hex(),
+            'strategy': solver.strategy.name,
+            'pool': solver.strategy.pool,
+            'hard': solver.hard,
+        }
+
+    @property
+    def best(self):
+        """
+        lowest mean of the openers evaluated so far
+        """
+        means = [mean for mean, _worst, _solved in self.results.values() if mean is not None]
+        return min(means, default=None)
+
+    def ranking(self):
+        """
+        [(opener, mean, worst)] of every fully evaluated opener, best first
+        """
+        ranking = [
+            (opener, mean, worst)
+            for opener, (mean, worst, _solved) in self.results.items()
+            if mean is not None
+        ]
+        return sorted(ranking, key=lambda item: (item[1], item[2], item[0]))
+
+    def save(self):
+        if not self.checkpoint:
+            return
+
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'meta': self.meta, 'answers': self.answers, 'results': self.results}, f)
+        os.replace(tmp, self.checkpoint)
+
+    def run(self, openers, answers, callback=None):
+        """
+        evaluate openers, skipping any in the checkpoint. callback(opener, mean,
+        worst, solved) is called after each opener
+        """
+        if self.answers is not None and sorted(answers) != self.answers:
+            raise ValueError(f"checkpoint {self.checkpoint} was made with different answers")
+
+        self.answers = sorted(answers)
+        todo = [opener for opener in openers if opener not in self.results]
+        inflight = {}
+
+        with concurrent.futures.ProcessPoolExecutor(self.bench.workers, initializer=init_worker, initargs=(self.bench.args,)) as pool:
+            while todo or inflight:
+                # only a few in flight so new submissions see the latest bound
+                while todo and len(inflight) < self.bench.workers * 2:
+                    opener = todo.pop(0)
+                    inflight[pool.submit(evaluate_opener, opener, answers, self.best)] = opener
+
+                done, _ = concurrent.futures.wait(inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+                    del inflight[future]
+                    opener, mean, worst, solved = future.result()
+                    self.results[opener] = [mean, worst, solved]
+                    self.save()
+
+                    if callback:
+                        callback(opener, mean, worst, solved)
+
+        return self.ranking()
@@ -0,0 +1,193 @@
+import re
+
+from .wordle import Wordle
+from .wordstore import LETTERS
+
+ALL_LETTERS = (1 << len(LETTERS)) - 1
+
+def letter_bit(c):
+    return 1 << (ord(c) - ord('a'))
+
+
+class Constraint:
+    """
+    what a word must look like to be a possible answer
+
+    allowed[i] is a 26 bit mask of the letters allowed at position i,
+    min_counts and max_counts map a letter to the number of times it must
+    appear in the word, a max count of 0 excludes the letter.
+    """
+
+    # a regex pattern position: any letter, a letter or a negated class, eg. [^ab]
+    PATTERN_TOKEN = re.compile(r'\[\^([a-z]*)\]|([a-z])|\.')
+
+    def __init__(self, wordlen):
+        self.wordlen    = wordlen
+        self.allowed    = [ALL_LETTERS] * wordlen
+        self.min_counts = {}
+        self.max_counts = {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.pattern} min={self.min_counts} max={self.max_counts}>"
+
+    @classmethod
+    def from_pattern(cls, pattern, wordlen, contains='', excludes=''):
+        """
+        build a constraint from a Solver.parse_response/interactive style regex,
+        a short pattern only constrains the start of the word
+        """
+        constraint = cls(wordlen)
+
+        for i, m in enumerate(cls.PATTERN_TOKEN.finditer(pattern)):
+            negated, letter = m.groups()
+
+            if letter:
+                constraint.fix(i, letter)
+            elif negated:
+                for c in negated:
+                    constraint.forbid(i, c)
+
+        for c in contains:
+            constraint.require(c)
+
+        for c in excludes:
+            constraint.exclude(c)
+
+        return constraint
+
+    def copy(self):
+        constraint = self.__class__(self.wordlen)
+        constraint.allowed    = list(self.allowed)
+        constraint.min_counts = dict(self.min_counts)
+        constraint.max_counts = dict(self.max_counts)
+        return constraint
+
+    @classmethod
+    def from_response(cls, guess, resp, hard=False):
+        constraint = cls(len(guess))
+        constraint.update(guess, resp, hard)
+        return constraint
+
+    def update(self, guess, resp, hard=False):
+        """
+        add what a wordle response to guess tells us about the word
+
+        a letter's exact and in responses give the minimum number of times it
+        appears, if the same letter was also out then that is the exact count.
+        eg. word: hatch, guess: catch -> oeeee, there is exactly one c
+
+        with hard set only add the hints hard mode makes you use: exact
+        letters stay in place and in letters must be used again
+        """
+        for i, (c, r) in enumerate(zip(guess, resp)):
+            if r == Wordle.LETTER_EXACT:
+                self.fix(i, c)
+            elif not hard:
+                self.forbid(i, c)
+
+        for c in set(guess):
+            found = sum(1 for g, r in zip(guess, resp) if g == c and r != Wordle.LETTER_OUT)
+            out = any(g == c and r == Wordle.LETTER_OUT for g, r in zip(guess, resp))
+
+            if found:
+                self.require(c, found)
+
+            if out and not hard:
+                self.limit(c, found)
+
+    @property
+    def pattern(self):
+        """
+        the positional part of the constraint as a regex
+        """
+        def _position(allowed):
+            if allowed == ALL_LETTERS:
+                return '.'
+
+            letters = [c for c in LETTERS if allowed & letter_bit(c)]
+            if len(letters) == 1:
+                return letters[0]
+
+            return f"[^{''.join(c for c in LETTERS if not allowed & letter_bit(c))}]"
+
+        return ''.join(_position(allowed) for allowed in self.allowed)
+
+    def fix(self, i, c):
+        """
+        letter c must be at position i
+        """
+        self.allowed[i] &= letter_bit(c)
+
+    def forbid(self, i, c):
+        """
+        letter c can't be at position i
+        """
+        self.allowed[i] &= ~letter_bit(c)
+
+    def require(self, c, count=1):
+        """
+        letter c must appear at least count times
+        """
+        self.min_counts[c] = max(self.min_counts.get(c, 0), count)
+
+    def limit(self, c, count):
+        """
+        letter c can appear at most count times
+        """
+        self.max_counts[c] = min(self.max_counts.get(c, self.wordlen), count)
+
+    def exclude(self, c):
+        self.limit(c, 0)
+
+    def matches(self, word):
+        """
+        does word satisfy this constraint, constant time for a given word length
+        """
+        for allowed, c in zip(self.allowed, word):
+            if not allowed & letter_bit(c):
+                return False
+
+        for c, count in self.min_counts.items():
+            if word.count(c) < count:
+                return False
+
+        for c, count in self.max_counts.items():
+            if word.count(c) > count:
+                return False
+
+        return True
+
+    def filter(self, store, bits=None):
+        """
+        return the bitset of word ids in store (limited to bits if given)
+        that satisfy this constraint, uses the store's letter indexes
+        """
+        if bits is None:
+            bits = store.all.bits
+
+        for i, allowed in enumerate(self.allowed):
+            if allowed == ALL_LETTERS:
+                continue
+
+            letters = [ord(c) - ord('a') for c in LETTERS if allowed & letter_bit(c)]
+            positions = store.positions[i]
+
+            if len(letters) <= len(LETTERS) // 2:
+                union = 0
+                for c in letters:
+                    union |= positions[c]
+                bits &= union
+            else:
+                for c in range(len(LETTERS)):
+                    if not allowed >> c & 1:
+                        bits &= ~positions[c]
+
+        for c, count in self.min_counts.items():
+            if count > 0:
+                bits &= store.counts[ord(c) - ord('a')][count]
+
+        for c, count in self.max_counts.items():
+            if count < self.wordlen:
+                bits &= ~store.counts[ord(c) - ord('a')][count + 1]
+
+        return bits
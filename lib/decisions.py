@@ -0,0 +1,183 @@
+import json
+import collections
+
+from lib.wordle import Wordle
+from lib.responses import digest
+
+
+class DecisionCache:
+    """
+    LRU cache of the suggestions a solver made after a sequence of rounds
+
+    starting from the whole dictionary the remaining words only depend on
+    the (guess, response) rounds so far, so every solve that gets the same
+    responses can reuse the suggestions. a maxsize of 0 disables the cache.
+    """
+
+    MAXSIZE = 10000
+
+    def __init__(self, maxsize=MAXSIZE):
+        self.maxsize = maxsize
+        self.hits    = 0
+        self.misses  = 0
+        self._cache  = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {len(self)}/{self.maxsize} hits={self.hits} misses={self.misses}>"
+
+    @staticmethod
+    def key(history):
+        return tuple(history)
+
+    def get(self, history):
+        """
+        the suggestions stored for history or None
+        """
+        key = self.key(history)
+
+        if key not in self._cache:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return self._cache[key]
+
+    def put(self, history, suggestions):
+        if not self.maxsize:
+            return
+
+        self._cache[self.key(history)] = suggestions
+
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+
+class DecisionTree:
+    """
+    the guess a solver makes for every reachable sequence of responses
+
+    a node is [guess] or [guess, {response: node}], responses that end the
+    game (all exact) have no node. the tree is saved as compact json along
+    with the dictionary digest it was built for.
+    """
+
+    VERSION = 1
+    MAX_DEPTH = 20 # a solver that can't finish a word is broken
+
+    def __init__(self, root, meta):
+        self.root = root
+        self.meta = meta
+
+    def __len__(self):
+        def _count(node):
+            return 1 + sum(_count(child) for child in self.children(node).values())
+        return _count(self.root)
+
+    @staticmethod
+    def children(node):
+        return node[1] if len(node) > 1 else {}
+
+    @classmethod
+    def build(cls, solver, callback=None):
+        """
+        play out every possible answer with solver, callback(history, guess) is
+        called for each node as it's added
+        """
+        wordle = solver.wordle
+        found_resp = Wordle.LETTER_EXACT * solver.wordlen
+
+        def _build(depth):
+            if depth > cls.MAX_DEPTH:
+                raise RuntimeError(f"solver can't finish after {solver.history}")
+
+            guess = solver.get_suggestions(1)[0][0]
+            if callback:
+                callback(solver.history, guess)
+
+            buckets = wordle.partition(guess, solver.words)
+            children = {}
+            state = (solver.words, solver.constraint.copy(), solver.hints.copy(), list(solver.history))
+
+            for resp in sorted(Wordle.decode(code, solver.wordlen) for code in buckets):
+                if resp == found_resp:
+                    continue
+
+                solver.words, solver.constraint, solver.hints, solver.history = (
+                    state[0], state[1].copy(), state[2].copy(), list(state[3])
+                )
+                solver.prune_words(guess, resp)
+                children[resp] = _build(depth + 1)
+
+            solver.words, solver.constraint, solver.hints, solver.history = state
+            return [guess, children] if children else [guess]
+
+        solver.reset()
+        root = _build(1)
+        solver.reset()
+
+        meta = {
+            'version': cls.VERSION,
+            'wordlen': solver.wordlen,
+            'digest': digest(wordle.dictionary, solver.wordlen).hex(),
+            'strategy': solver.strategy.name,
+            'pool': solver.strategy.pool,
+            'hard': solver.hard,
+        }
+        return cls(root, meta)
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump({'meta': self.meta, 'tree': self.root}, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path, wordle, hard=False):
+        """
+        load a tree for the given Wordle's dictionary, a normal mode tree
+        suggests guesses hard mode doesn't allow (and vice versa)
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        meta = data['meta']
+        if any([
+            meta['version'] != cls.VERSION,
+            meta['wordlen'] != wordle.wordlen,
+            meta['digest'] != digest(wordle.dictionary, wordle.wordlen).hex(),
+        ]):
+            raise ValueError(f"decision tree {path} was built for a different dictionary")
+
+        if meta.get('hard', False) != hard:
+            mode = 'hard' if meta.get('hard') else 'normal'
+            raise ValueError(f"decision tree {path} was built for {mode} mode")
+
+        return cls(data['tree'], meta)
+
+    def get(self, history):
+        """
+        the guess to make after the (guess, response) rounds in history, or
+        None if history leaves the tree
+        """
+        node = self.root
+
+        for guess, resp in history:
+            if node[0] != guess:
+                return None
+
+            node = self.children(node).get(resp)
+            if node is None:
+                return None
+
+        return node[0]
@@ -1,9 +1,9 @@
 import pathlib
 import curses
-import re
 import asyncio
 import string
 import functools
+import concurrent.futures
 
 import click
 import urwid
@@ -15,11 +15,13 @@ logging.getLogger('asyncio').setLevel(logging.WARNING)
 logger = logging.getLogger()
 
 from lib.wordle import Wordle
+from lib.constraint import Constraint
+from lib.utils import popcount, bit_ids, ids_to_bits
 
 class Signal:
     """
     a blinker.signal that is also a variable
-    when signal.value is set, emit the new value
+    when signal.value is set to something different, emit the new value
     """
 
     def __init__(self, *args, **kw):
@@ -32,6 +34,9 @@ class Signal:
 
     @value.setter
     def value(self, value):
+        if value == self._value:
+            return
+
         self._value = value
         self._signal.send(self._signal.name, value=self.value)
 
@@ -99,13 +104,18 @@ class WinPattern(Window):
             self.prev = key
             return
 
+        # only letters can be excluded or included
+        if self.prev in ('!', '@') and key not in string.ascii_lowercase:
+            self.prev = ''
+
+        # !c and @c toggle c, so a mistake can be taken back
         if self.prev == '!':
-            signals.excludes.value = ''.join(sorted(set(signals.excludes.value + key)))
+            signals.excludes.value = ''.join(sorted(set(signals.excludes.value) ^ {key}))
             self.prev = ''
             return
 
         if self.prev == '@':
-            signals.includes.value += key
+            signals.includes.value = ''.join(sorted(set(signals.includes.value) ^ {key}))
             self.prev = ''
             return
 
@@ -192,16 +202,153 @@ class WinIncludes(Window):
         self.widget.set_text(text)
 
 
+class MatchWalker(urwid.ListWalker):
+    """
+    the matching words as rows of columns words, a row's Text is only built
+    when the ListBox asks for it, ie. when it's on screen. shows messages
+    instead when there are any
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.ids = []
+        self.bits = None # of the words in ids
+        self.messages = []
+        self.columns = 1
+        self.focus = 0
+        self.rows = {} # row widgets built since the last change
+
+    def set_words(self, words):
+        """
+        list words (a WordSet), the same words again keep their scroll position
+        """
+        if not self.messages and words.bits == self.bits:
+            return
+
+        self.ids = words.ids
+        self.bits = words.bits
+        self.messages = []
+        self.changed(0)
+
+    def set_messages(self, messages):
+        self.ids = []
+        self.bits = None
+        self.messages = messages
+        self.changed(0)
+
+    def set_columns(self, columns):
+        """
+        rewrap to columns words per row, keeping the focused row's first
+        word in view. called while rendering so it doesn't emit modified
+        """
+        if columns == self.columns:
+            return
+
+        if not self.messages:
+            self.focus = self.focus * self.columns // columns
+
+        self.columns = columns
+        self.rows = {}
+
+    def changed(self, focus):
+        self.focus = focus
+        self.rows = {}
+        self._modified()
+
+    def __len__(self):
+        if self.messages:
+            return len(self.messages)
+
+        return -(-len(self.ids) // self.columns)
+
+    def row(self, position):
+        if not 0 <= position < len(self):
+            return None, None
+
+        if position not in self.rows:
+            if self.messages:
+                text = self.messages[position]
+            else:
+                words = self.store.words
+                start = position * self.columns
+                text = ' '.join(words[i] for i in self.ids[start:start + self.columns])
+
+            self.rows[position] = urwid.Text(text, wrap='clip')
+
+        return self.rows[position], position
+
+    def get_focus(self):
+        return self.row(self.focus)
+
+    def set_focus(self, position):
+        self.focus = position
+        self._modified()
+
+    def get_next(self, position):
+        return self.row(position + 1)
+
+    def get_prev(self, position):
+        return self.row(position - 1)
+
+
+class MatchList(urwid.ListBox):
+    """
+    a ListBox that fits as many words per row as its width allows and
+    remembers its size so App can scroll it
+    """
+
+    def __init__(self, walker):
+        super().__init__(walker)
+        self.size = None
+
+    def render(self, size, focus=False):
+        maxcol, _ = size
+        self.size = size
+        self.body.set_columns(max(1, (maxcol + 1) // (app.args['wordlen'] + 1)))
+
+        return super().render(size, focus)
+
+    def keypress(self, size, key):
+        if key == 'home' and len(self.body):
+            self.set_focus(0)
+            self.set_focus_valign('top')
+            return
+
+        if key == 'end' and len(self.body):
+            self.set_focus(len(self.body) - 1)
+            self.set_focus_valign('bottom')
+            return
+
+        return super().keypress(size, key)
+
+
 class WinMatches(Window):
 
+    # below this many matches it's quicker to check each word than to
+    # intersect the dictionary sized letter bitsets
+    SCAN_LIMIT = 256
+
+    # seconds to wait for more keystrokes before recalculating
+    DEBOUNCE = 0.05
+
+    HELP = ['. is a wildcard', '! to exclude a letter', '@ to include a letter']
+
     def __init__(self, *args, **kw):
         super().__init__(
-            urwid.Filler(
-                urwid.Text(''),
-                valign='top',
-            )
+            MatchList(MatchWalker(app.store))
         )
 
+        # (state, bits) for every refinement of the current state, loosest
+        # first, and the dictionary they were filtered from
+        self.stack = []
+        self.stack_words = None
+
+        # matching runs on one worker thread, so only one touches the stack,
+        # pending holds the latest future for each kind of job
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.pending = {}
+        self.alarm = None
+
         signals.dictionary.connect(self.cb_dictionary)
         signals.pattern.connect(self.cb_pattern)
         signals.excludes.connect(self.cb_excludes)
@@ -216,23 +363,31 @@ class WinMatches(Window):
         self.recalc()
 
     def cb_excludes(self, sender, value):
-        signals.dictionary.value = self.pattern_match(self.dictionary, None, value, self.includes)
+        self.recalc()
 
     def cb_includes(self, sender, value):
-        # FIXME
-        signals.dictionary.value = self.pattern_match(self.dictionary, None, self.excludes, value)
+        self.recalc()
+
+    def cb_matched(self, words):
+        self.words = words
 
     @property
     def widget(self):
-        return self.original_widget.original_widget.original_widget
+        # the MatchList
+        return self.original_widget.original_widget
 
     @property
-    def text(self):
-        return self.widget.get_text()
+    def walker(self):
+        return self.widget.body
 
-    @text.setter
-    def text(self, value):
-        return self.widget.set_text(value)
+    def scroll(self, key):
+        """
+        scroll the list, using the size it was last drawn at
+        """
+        if self.widget.size is not None:
+            return self.widget.keypress(self.widget.size, key)
+
+        return key
 
     @property
     def dictionary(self):
@@ -258,34 +413,124 @@ class WinMatches(Window):
     def words(self, value):
         signals.wordlist.value = value
 
+        # invisible mode only counts, the words are never listed
         if app.args['invisible']:
-            self.text = 'running in invisible mode'
+            self.walker.set_messages(['running in invisible mode'])
         elif self.pattern:
-            self.text = ' '.join(self.words)
+            self.walker.set_words(value)
         else:
-            self.text = '. is a wildcard\n! to exclude a letter\n@ to include a letter'
+            self.walker.set_messages(self.HELP)
 
     def recalc(self):
+        """
+        recalculate the wordlist once typing pauses
+        """
+        if app.loop is None:
+            # still setting up, there's nothing to draw yet
+            self.words = self.pattern_match(self.dictionary, self.pattern, self.excludes, self.includes)
+            return
+
+        if self.alarm is not None:
+            app.loop.remove_alarm(self.alarm)
+
+        self.alarm = app.loop.set_alarm_in(self.DEBOUNCE, self.cb_alarm)
+
+    def cb_alarm(self, loop, user_data):
         logger.debug("recalculating wordlist")
-        self.words = self.pattern_match(self.dictionary, self.pattern, self.excludes, self.includes)
+        self.alarm = None
+        self.submit('wordlist', self.cb_matched, self.match, self.dictionary, self.pattern, self.excludes, self.includes)
+
+    def submit(self, kind, callback, func, *args):
+        """
+        run func(*args) on the worker thread and pass the result to callback
+        on the ui thread, unless another job of the same kind replaces it first
+        """
+        if app.loop is None:
+            callback(func(*args))
+            return
+
+        stale = self.pending.get(kind)
+        if stale is not None:
+            stale.cancel() # a no-op if it's already running
+
+        future = asyncio.get_event_loop().run_in_executor(self.executor, func, *args)
+        future.add_done_callback(functools.partial(self.cb_done, kind, callback))
+        self.pending[kind] = future
+
+    def cb_done(self, kind, callback, future):
+        if self.pending.get(kind) is not future:
+            return # superseded by a newer job
+
+        del self.pending[kind]
+
+        if future.cancelled():
+            return
+
+        callback(future.result())
+        app.loop.draw_screen()
+
+    @staticmethod
+    def implies(old, new):
+        """
+        is every word matching the new state also matched by the old state,
+        ie. the new state only adds letters to the pattern, includes or excludes
+        """
+        old_pattern, old_excludes, old_includes = old
+        new_pattern, new_excludes, new_includes = new
+
+        if len(old_pattern) > len(new_pattern):
+            old_pattern = old_pattern.rstrip('.')
+            if len(old_pattern) > len(new_pattern):
+                return False
+
+        if any(c != '.' and c != n for c, n in zip(old_pattern, new_pattern)):
+            return False
+
+        return set(old_excludes) <= set(new_excludes) and set(old_includes) <= set(new_includes)
+
+    def match(self, words, pattern, excludes, includes):
+        """
+        pattern_match, also listing the ids that will be shown so it
+        happens on the worker thread
+        """
+        words = self.pattern_match(words, pattern, excludes, includes)
+
+        if pattern and not app.args['invisible']:
+            words.ids
+
+        return words
 
     def pattern_match(self, words, pattern, excludes, includes):
-        if not pattern:
-            pattern = '.' * app.args['wordlen']
+        """
+        the words that match as a WordSet, which is already in alphabetical
+        order. narrowed from the last result this state refines, so typing
+        another letter only looks at the words that matched before it
+        """
+        store = app.store
+        state = (pattern or '', excludes, includes)
+
+        if words is not self.stack_words:
+            self.stack = []
+            self.stack_words = words
+
+        # backspace or a looser state, drop back to a result it refines
+        while self.stack and not self.implies(self.stack[-1][0], state):
+            self.stack.pop()
+
+        # nothing new, eg. a trailing wildcard
+        if self.stack and self.implies(state, self.stack[-1][0]):
+            return store.subset(self.stack[-1][1])
 
-        matches = []
-        pattern = re.compile(pattern)
-        check_includes = not bool(includes)
+        bits = self.stack[-1][1] if self.stack else store.bits(words)
+        constraint = Constraint.from_pattern(state[0], app.args['wordlen'], set(includes), excludes)
 
-        for word in words:
-            if all([
-                pattern.match(word),     # re.match is beginning of string
-                not any([c in word for c in excludes]),
-                check_includes or all([c in word for c in includes]),
-            ]):
-                matches.append(word)
+        if popcount(bits) <= self.SCAN_LIMIT:
+            bits = ids_to_bits(i for i in bit_ids(bits) if constraint.matches(store.words[i]))
+        else:
+            bits = constraint.filter(store, bits)
 
-        return sorted(matches)
+        self.stack.append((state, bits))
+        return store.subset(bits)
 
 
 class WinCounts(Window):
@@ -361,16 +606,26 @@ class MainFrame(urwid.Frame):
 
 class App:
 
+    # keys the pattern doesn't use that scroll the matches
+    SCROLL_KEYS = ('up', 'down', 'page up', 'page down', 'home', 'end')
+
     def __init__(self, args):
         self.args = args
+        self.loop = None
 
     def setup(self):
 
+        # load the dictionary and build its letter position index once,
+        # before the first keystroke needs it
+        wordle = Wordle(self.args['dict'], self.args['wordlen'])
+        self.store = wordle.store
+        self.store.positions
+        self.store.counts
+
         self.frame = MainFrame(focus_part='header')
         replace_handlers(logger, self.frame.win_logging)
 
-        # load and send dictionary to listeners
-        wordle = Wordle(self.args['dict'], self.args['wordlen'])
+        # send dictionary to listeners
         signals.dictionary.value = wordle.words
 
     def run(self):
@@ -402,6 +657,9 @@ class App:
         if key in ('f10', 'esc'):
             raise urwid.ExitMainLoop()
 
+        if key in self.SCROLL_KEYS:
+            return self.frame.body.scroll(key)
+
         return key
 
 
@@ -438,17 +696,21 @@ def cli(ctx, *_, **args):
 
     \b
     .  for wildcard
-    !c to add a letter to the exclude list
+    !c to exclude a letter, again to stop excluding it
+    @c to include a letter, again to stop including it
     """
 
     global app
     app = App(args)
     app.setup()
 
-    for c in args['excludes']:
-        signals.excludes.value = ''.join(sorted(set(signals.excludes.value + c)))
+    # like typed letters, only a-z can be excluded or included
+    for c in args['excludes'].lower():
+        if c in string.ascii_lowercase:
+            signals.excludes.value = ''.join(sorted(set(signals.excludes.value + c)))
 
-    for c in args['includes']:
-        signals.includes.value += c
+    for c in args['includes'].lower():
+        if c in string.ascii_lowercase:
+            signals.includes.value = ''.join(sorted(set(signals.includes.value + c)))
 
     app.run()       # blocking call
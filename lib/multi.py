@@ -0,0 +1,129 @@
+import heapq
+import collections
+
+from lib.wordle import Wordle
+from lib.constraint import Constraint
+from lib.strategy import Strategy, EntropyStrategy
+
+
+class Board:
+    """
+    one of the puzzles of a multi board game
+    """
+
+    def __init__(self, wordle):
+        self.wordle     = wordle
+        self.words      = wordle.dictionary
+        self.constraint = Constraint(wordle.wordlen)
+        self.solved     = False
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {len(self.words)} words solved={self.solved}>"
+
+    def prune_words(self, guess, resp):
+        if resp == Wordle.LETTER_EXACT * self.wordle.wordlen:
+            self.solved = True
+
+        store = self.wordle.store
+        self.constraint.update(guess, resp)
+        self.words = store.subset(self.constraint.filter(store, self.words.bits))
+
+
+class MultiSolver:
+    """
+    solve several boards at once (dordle, quordle, ...), every guess is played
+    on every board.
+
+    a guess is scored by the total entropy of the response partition of each
+    unsolved board's candidates plus its chance of solving a board, every
+    board picks its candidates' codes from the same response matrix row.
+    """
+
+    TOP = 6 # number of suggestions passed to the solve callback
+
+    def __init__(self, wordle, boards, pool=None):
+        self.wordle    = wordle
+        self.boards    = [Board(wordle) for _ in range(boards)]
+        self.pool      = pool or Strategy.POOL_CANDIDATES
+        self.iteration = 0
+
+        wordle.require_matrix()
+
+    @property
+    def unsolved(self):
+        return [board for board in self.boards if not board.solved]
+
+    def guesses(self):
+        if self.pool == Strategy.POOL_DICTIONARY:
+            return self.wordle.dictionary
+
+        words = self.wordle.store.subset(0)
+        for board in self.unsolved:
+            words |= board.words
+        return words
+
+    def scores(self, guesses):
+        """
+        (word, score) for each guess
+        """
+        # boards with the same candidates (eg. every board before the first
+        # guess) partition the same way, only score them once
+        same = collections.Counter(board.words.bits for board in self.unsolved if board.words)
+        store = self.wordle.store
+        boards = [(store.subset(bits), n) for bits, n in same.items()]
+
+        for word, codes in self.wordle.bulk_response_codes_multi(guesses, [words for words, _n in boards]):
+            score = 0
+
+            for (candidates, n), board_codes in zip(boards, codes):
+                total = len(candidates)
+                score += n * EntropyStrategy.entropy(collections.Counter(board_codes).values(), total)
+
+                if word in candidates:
+                    # a board with one word left is a free solve, take it first
+                    score += n * (len(self.boards) if total == 1 else 1 / total)
+
+            yield word, score
+
+    def get_suggestions(self, k=None):
+        suggestions = self.scores(self.guesses())
+        key = lambda item: (-item[1], item[0])
+
+        if k is not None:
+            return heapq.nsmallest(k, suggestions, key=key)
+
+        return sorted(suggestions, key=key)
+
+    def prune_words(self, guess, responses):
+        """
+        responses is the response of each unsolved board, in order
+        """
+        for board, resp in zip(self.unsolved, responses):
+            board.prune_words(guess, resp)
+
+    def solve(self, words, callback=None):
+        """
+        solve a board for each of the given words, return the number of rounds
+        """
+        assert len(words) == len(self.boards), f"need {len(self.boards)} words"
+        self.iteration = 0
+
+        while self.unsolved and all(board.words for board in self.unsolved):
+            self.iteration += 1
+            suggestions = self.get_suggestions(self.TOP)
+            guess = suggestions[0][0]
+
+            unsolved = [i for i, board in enumerate(self.boards) if not board.solved]
+            responses = [self.wordle.check_word(words[i], guess) for i in unsolved]
+            self.prune_words(guess, responses)
+
+            if callback:
+                callback(
+                    iteration=self.iteration,
+                    suggestions=suggestions,
+                    guess=guess,
+                    boards=unsolved,
+                    responses=responses,
+                )
+
+        return self.iteration
@@ -0,0 +1,194 @@
+import os
+import mmap
+import array
+import struct
+import hashlib
+import pathlib
+
+# response digits, a response code is a base 3 number where position 0 of the
+# word is the least significant digit
+OUT   = 0
+IN    = 1
+EXACT = 2
+
+# cache file header: magic, version, wordlen, word count, typecode, dictionary digest
+HEADER = struct.Struct('=4sHHIc20s')
+HEADER_SIZE = 64 # keep the codes aligned
+MAGIC = b'WRDL'
+VERSION = 1
+
+def cache_dir():
+    """
+    where response matrices are cached
+    """
+    root = os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home() / '.cache'
+    return pathlib.Path(root) / 'wordle'
+
+def digest(words, wordlen):
+    """
+    hash of the word list content and word length
+    """
+    h = hashlib.sha1(f"{wordlen}\n".encode())
+    h.update('\n'.join(sorted(words)).encode())
+    return h.digest()
+
+def typecode(wordlen):
+    """
+    smallest array typecode that can hold every response code for wordlen
+    """
+    count = 3 ** wordlen
+
+    # by itemsize, 'L' is 8 bytes on most 64 bit platforms
+    for tc in 'BHIL':
+        if count <= 1 << (8 * array.array(tc).itemsize):
+            return tc
+
+    raise ValueError(f"response codes of {wordlen} letter words don't fit in an array")
+
+def response_code(word, guess):
+    """
+    return the response for guess as an integer, same rules as Wordle.check_word
+    """
+    code = 0
+    power = 1
+    rest = []   # letters of word not matched exactly
+    misses = [] # (power, letter) of guess not matched exactly
+
+    for w, g in zip(word, guess):
+        if w == g:
+            code += EXACT * power
+        else:
+            rest.append(w)
+            misses.append((power, g))
+        power *= 3
+
+    for power, g in misses:
+        if g in rest:
+            code += IN * power
+            rest.remove(g)
+
+    return code
+
+
+class ResponseMatrix:
+    """
+    precomputed response code of every (guess, answer) pair of a word list
+
+    codes are stored row major in a compact array, codes[guess * n + answer]
+    """
+
+    def __init__(self, words, wordlen, codes=None):
+        self.wordlen = wordlen
+        self.words   = sorted(words)
+        self.ids     = {word: i for i, word in enumerate(self.words)}
+        self.codes   = codes if codes is not None else self.build(self.words, wordlen)
+
+    @classmethod
+    def cached(cls, words, wordlen, cachedir=None, build=True, source=None):
+        """
+        load the matrix for words from the cache, building and saving it
+        if the cache file is missing or stale. returns None instead of
+        building it unless build
+
+        the cache file is named after source (the dictionary file) when given,
+        so an edited dictionary replaces its stale matrix instead of adding
+        another, the header digest tells them apart
+        """
+        words = sorted(words)
+        key = digest(words, wordlen)
+        name = hashlib.sha1(str(pathlib.Path(source).resolve()).encode()).digest() if source else key
+        path = pathlib.Path(cachedir or cache_dir()) / f"matrix-{wordlen}-{name.hex()[:16]}.bin"
+
+        codes = cls.load(path, len(words), wordlen, key)
+        if codes is not None:
+            return cls(words, wordlen, codes)
+
+        if not build:
+            return None
+
+        matrix = cls(words, wordlen)
+        matrix.save(path, key)
+        return matrix
+
+    @staticmethod
+    def load(path, count, wordlen, key):
+        """
+        memory map the codes in path so processes share the pages, return
+        None if the file doesn't exist or doesn't match the word list
+        """
+        try:
+            with open(path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        tc = typecode(wordlen)
+        size = HEADER_SIZE + count * count * array.array(tc).itemsize
+
+        if len(mm) != size or HEADER.unpack_from(mm) != (MAGIC, VERSION, wordlen, count, tc.encode(), key):
+            mm.close()
+            return None
+
+        return memoryview(mm)[HEADER_SIZE:].cast(tc)
+
+    def save(self, path, key):
+        """
+        write the codes to path, writes to a temp file first so readers
+        never see a partial file
+        """
+        path = pathlib.Path(path)
+        tc = typecode(self.wordlen)
+        header = HEADER.pack(MAGIC, VERSION, self.wordlen, len(self.words), tc.encode(), key)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+            with open(tmp, 'wb') as f:
+                f.write(header.ljust(HEADER_SIZE, b'\0'))
+                f.write(bytes(self.codes))
+
+            os.replace(tmp, path)
+        except OSError:
+            # the cache is only an optimization
+            pass
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.ids
+
+    @staticmethod
+    def build(words, wordlen):
+        codes = array.array(typecode(wordlen))
+
+        for guess in words:
+            codes.extend([response_code(word, guess) for word in words])
+
+        return codes
+
+    def row(self, guess_id):
+        """
+        response codes of guess against every answer, indexed by answer id
+        """
+        n = len(self.words)
+        return self.codes[guess_id * n:(guess_id + 1) * n]
+
+    def column(self, word_id):
+        """
+        response codes of every guess against an answer, indexed by guess id
+        """
+        return self.codes[word_id::len(self.words)]
+
+    def code(self, word, guess):
+        """
+        response code of guess against word, None if either is unknown
+        """
+        word_id = self.ids.get(word)
+        guess_id = self.ids.get(guess)
+
+        if word_id is None or guess_id is None:
+            return None
+
+        return self.codes[guess_id * len(self.words) + word_id]
@@ -1,6 +1,11 @@
+import re
+import math
+import heapq
+import operator
 import pathlib
 import itertools
-import copy
+import functools
+import collections
 
 import click
 
@@ -10,14 +15,17 @@ print = Console(color_system='truecolor', highlight=False).print
 
 from lib.wordle import Wordle
 from lib.wordleui import WordleUI
-from lib.utils import dotdict
+from lib.utils import dotdict, popcount, bit_ids, ids_to_bits
 from lib.solver import Solver
+from lib.constraint import Constraint
 
 def to_list(ctx, param, value):
     return list(value)
 
 class ReverserUI:
 
+    COUNT_CAP = 1000000 # hard mode sequences have to be enumerated to count them
+
     def __init__(self, args):
         args = dotdict(args)
 
@@ -26,6 +34,9 @@ class ReverserUI:
         self.solver  = Solver(args)
         self.summary = self.parse_summary(args.summary)
 
+        if len(args.guesses) > len(self.summary):
+            raise click.UsageError(f"{len(args.guesses)} GUESSES given for {len(self.summary)} rounds")
+
     @property
     def wordle(self):
         return self.solver.wordle
@@ -45,6 +56,21 @@ class ReverserUI:
     def length(self):
         return len(self.words)
 
+    @staticmethod
+    def parse_line(line):
+        """
+        convert one line of emoji to a list of responses
+        """
+        _line = []
+        for r in line:
+            if r in WordleUI.EMOJI_IN:
+                _line.append(Wordle.LETTER_IN)
+            elif r in WordleUI.EMOJI_OUT:
+                _line.append(Wordle.LETTER_OUT)
+            elif r in WordleUI.EMOJI_EXACT:
+                _line.append(Wordle.LETTER_EXACT)
+        return _line
+
     def parse_summary(self, spath):
         """
         convert the emoji summary and convert to text
@@ -55,27 +81,42 @@ class ReverserUI:
         ret = []
 
         for line in summary:
-            _line = []
-            for r in line:
-                if r in WordleUI.EMOJI_IN:
-                    _line.append(Wordle.LETTER_IN)
-                elif r in WordleUI.EMOJI_OUT:
-                    _line.append(Wordle.LETTER_OUT)
-                elif r in WordleUI.EMOJI_EXACT:
-                    _line.append(Wordle.LETTER_EXACT)
-            ret.append(_line)
+            _line = self.parse_line(line)
+
+            # skip the "Wordle 123 4/6" header and blank lines
+            if _line:
+                ret.append(_line)
 
         ret.reverse()
         # print(summary)
         # print(ret)
         return ret
 
+    @property
+    def rounds(self):
+        """
+        the summary responses as strings in the order they were played
+        """
+        return [''.join(resp) for resp in reversed(self.summary)]
+
+    @functools.cached_property
+    def by_response(self):
+        """
+        bitset of dictionary words that give each response code against our word,
+        each summary row is then a single lookup
+        """
+        ids = collections.defaultdict(list)
+
+        for guess_id, code in enumerate(self.wordle.check_all(self.word)):
+            ids[code].append(guess_id)
+
+        return {code: ids_to_bits(guess_ids) for code, guess_ids in ids.items()}
+
     def parse_resp(self, resp):
         """
-        covert response to [exact, contains, excludes] tuple that
-        we can use to filter words
+        covert response to the response code we can use to filter words
         """
-        pass
+        return Wordle.encode(''.join(resp))
 
     def filter_words(self, word, resp):
         """
@@ -84,25 +125,274 @@ class ReverserUI:
 
         Note: resp is the previous response to the given words
         """
-        words = copy.copy(self.words)
+        assert word == self.word, f"responses are precomputed for {self.word}"
+        return self.wordle.store.subset(self.by_response.get(self.parse_resp(resp), 0))
+
+    def candidates(self):
+        """
+        bitset of possible guesses for each round. in hard mode a guess must
+        use the hints of the previous guess, repeat until nothing changes
+        """
+        store = self.wordle.store
+        rounds = self.rounds
+        rows = [self.filter_words(self.word, resp).bits for resp in rounds]
+
+        for i, guess in enumerate(self.args.guesses):
+            rows[i] &= store.bits([guess])
+
+        changed = self.args.hard
+
+        while changed:
+            changed = False
+
+            for i in range(len(rows) - 1):
+                supported = 0   # next round guesses allowed by some guess this round
+                keep = 0        # guesses this round that allow some next round guess
+
+                for guess_id in bit_ids(rows[i]):
+                    hints = Constraint.from_response(store[guess_id], rounds[i], hard=True)
+                    allowed = hints.filter(store, rows[i + 1])
+
+                    if allowed:
+                        keep |= 1 << guess_id
+                        supported |= allowed
+
+                if keep != rows[i] or supported != rows[i + 1]:
+                    rows[i], rows[i + 1] = keep, supported
+                    changed = True
+
+        return rows
+
+    def count(self, rows, cap=None):
+        """
+        number of guess sequences, stops counting at cap in hard mode
+        """
+        if not self.args.hard:
+            # a guess has one response, so rounds with different responses
+            # never share a guess, rounds with the same response can't repeat
+            # one. rounds fixed by GUESSES take their guess out of the others
+            pinned = len(self.args.guesses)
+            groups = collections.defaultdict(list)
+            for i, resp in enumerate(self.rounds):
+                groups[resp].append(i)
+
+            total = 1
+            for group in groups.values():
+                used = 0
+                for i in group:
+                    if i < pinned:
+                        if not rows[i] or rows[i] & used:
+                            return 0
+                        used |= rows[i]
+
+                free = [i for i in group if i >= pinned]
+                if free:
+                    total *= math.perm(popcount(rows[free[0]] & ~used), len(free))
+            return total
+
+        total = 0
+        for _ in self.sequences(rows):
+            total += 1
+            if cap and total >= cap:
+                break
+        return total
+
+    def sequences(self, rows):
+        """
+        yield every possible sequence of guesses, a guess is never repeated
+        and in hard mode each guess uses the hints of every earlier guess
+        """
+        store = self.wordle.store
+        rounds = self.rounds
+
+        def _sequences(i, hints, used, sequence):
+            if i == len(rows):
+                yield sequence
+                return
+
+            bits = rows[i] & ~used
+            if self.args.hard:
+                bits = hints.filter(store, bits)
+
+            for guess_id in bit_ids(bits):
+                guess = store[guess_id]
+                _hints = hints.copy()
+                _hints.update(guess, rounds[i], hard=True)
+
+                yield from _sequences(i + 1, _hints, used | 1 << guess_id, sequence + [guess])
+
+        yield from _sequences(0, Constraint(self.wordle.wordlen), 0, [])
+
+    def run(self):
+        rows = self.candidates()
+
+        for i, (resp, bits) in enumerate(zip(self.rounds, rows)):
+            _resp = WordleUI.colorize_word(resp, resp)
+            print(f"round {i + 1}: {_resp} {popcount(bits):5} words")
+
+        count = self.count(rows, self.COUNT_CAP)
+        at_least = '>= ' if self.args.hard and count >= self.COUNT_CAP else ''
+        print(f"{at_least}{count} possible guess sequences")
+
+        for sequence in itertools.islice(self.sequences(rows), self.args.limit):
+            print(', '.join(
+                WordleUI.colorize_word(resp, guess)
+                for resp, guess in zip(self.rounds, sequence)
+            ))
+
+
+class BulkReverser:
+    """
+    find the answers that could have produced many summaries, without knowing
+    the answers. summaries of the same puzzle are intersected.
+    """
+
+    HEADER = re.compile(r'wordle\s+#?([\d,.]+)', re.IGNORECASE)
+
+    def __init__(self, args):
+        args = dotdict(args)
+
+        self.args   = args
+        self.wordle = Wordle(args.dict, args.wordlen, matrix=True)
+
+        self.achievable, self.cost = self.response_index()
+
+    def response_index(self):
+        """
+        achievable[code] is the bitset of answers that some guess gives the
+        response code for, cost[code][answer id] is minus the log of the
+        fraction of guesses that give code against that answer
+        """
+        store = self.wordle.store
+        answers = collections.defaultdict(list)
+        cost = collections.defaultdict(lambda: [math.inf] * len(store))
+
+        for answer_id, answer in enumerate(store):
+            codes = collections.Counter(self.wordle.check_all(answer))
+
+            for code, n in codes.items():
+                answers[code].append(answer_id)
+                cost[code][answer_id] = -math.log(n / len(store))
+
+        achievable = {code: ids_to_bits(ids) for code, ids in answers.items()}
+        return achievable, dict(cost)
+
+    def read(self, lines):
+        """
+        yield (puzzle, [response]) for each summary in lines, puzzle is None
+        without a "Wordle 123 4/6" header. a blank line or header ends a summary
+        """
+        puzzle = None
+        rows = []
+
+        for line in lines:
+            header = self.HEADER.search(line)
+            row = ReverserUI.parse_line(line)
+
+            if rows and (header or not row):
+                yield puzzle, rows
+                puzzle, rows = None, []
+
+            if header:
+                puzzle = re.sub(r'[,.]', '', header.group(1))
+            elif row:
+                rows.append(''.join(row))
+
+        if rows:
+            yield puzzle, rows
+
+    def candidates(self, codes):
+        """
+        bitset of answers that every response code could come from
+        """
+        bits = self.wordle.store.all.bits
+
+        for code in codes:
+            bits &= self.achievable.get(code, 0)
+
+        return bits
+
+    def ranking(self, bits, codes):
+        """
+        the candidate answers most likely to give the codes, {code: times seen},
+        to random guesses
+        """
+        # a code no answer can give (eg. four greens and a yellow) leaves
+        # nothing to rank, and has no cost column
+        if not bits:
+            return []
+
+        total = None
 
+        # sum the cost of every code for every answer a column at a time
+        for code, n in codes.items():
+            cost = self.cost[code]
+            if n > 1:
+                cost = [c * n for c in cost]
+            total = cost if total is None else list(map(operator.add, total, cost))
+
+        store = self.wordle.store
+        best = heapq.nsmallest(self.args.limit, bit_ids(bits), key=total.__getitem__)
+        return [store[answer_id] for answer_id in best]
+
+    def show(self, name, bits, codes, grids=1):
+        ranking = self.ranking(bits, codes)
+        print(f"{name}: {grids} grid(s), {popcount(bits)} answers: {', '.join(ranking)}")
+
+    def run(self, lines):
+        puzzles = {} # puzzle: [bits, codes, grids]
+
+        for n, (puzzle, rows) in enumerate(self.read(lines), 1):
+            if any(len(resp) != self.wordle.wordlen for resp in rows):
+                print(f"grid {n}: skipping, not {self.wordle.wordlen} letter responses")
+                continue
+
+            codes = collections.Counter(Wordle.encode(resp) for resp in rows)
+
+            if puzzle is None:
+                self.show(f"grid {n}", self.candidates(codes), codes)
+                continue
+
+            group = puzzles.setdefault(puzzle, [self.wordle.store.all.bits, collections.Counter(), 0])
+            group[0] &= self.candidates(codes)
+            group[1].update(codes)
+            group[2] += 1
+
+        for puzzle, (bits, codes, grids) in puzzles.items():
+            self.show(f"wordle {puzzle}", bits, codes, grids)
 
 
 @click.command()
 @click.option('--dict', default='dictionary.txt', type=click.Path(exists=True, readable=True, path_type=pathlib.Path))
-@click.option('-s', '--summary', default='summary.txt', required=True, type=click.Path(exists=True, readable=True, path_type=pathlib.Path))
-@click.argument('word', required=True, nargs=1)
+@click.option('--len', 'wordlen', default=5, type=int)
+@click.option('-s', '--summary', type=click.Path(exists=True, readable=True, path_type=pathlib.Path))
+@click.option('--bulk', type=click.File('r'), help="file of many summaries, - for stdin")
+@click.option('--hard', is_flag=True, help="the game was played in hard mode")
+@click.option('--limit', default=10, type=int, help="number of guess sequences or answers to show")
+@click.argument('word', required=False, nargs=1)
 @click.argument('guesses', required=False, nargs=-1, callback=to_list)
 @click.pass_context
 def cli(ctx, *_, **args):
     """
     try to reverse a Wordle puzzle given the word and summary.
 
-    This is probably computationally impossible.
+    shows how many dictionary words could have been guessed each round and
+    the possible sequences of guesses. GUESSES fixes the first guesses if known.
+
+    with --bulk the answers are unknown, rank the answers that could have
+    produced each summary in the file.
     """
 
     try:
+        if args['bulk']:
+            app = BulkReverser(args)
+            app.run(args['bulk'])
+            return
+
+        if not args['word'] or not args['summary']:
+            raise click.UsageError("WORD and --summary are required without --bulk")
+
         app = ReverserUI(args)
-        # app.run()
+        app.run()
     except KeyboardInterrupt:
         pass
@@ -1,21 +1,80 @@
-import re
 import collections
 import string
+import heapq
 
 from lib.wordle import Wordle
-from lib.utils import splice, dotdict
+from lib.constraint import Constraint
+from lib.strategy import STRATEGIES, HeuristicStrategy
+from lib.decisions import DecisionCache
+from lib.utils import dotdict
 
 class Solver:
 
+    TOP = 6 # number of suggestions passed to the solve callback
+
+    # how update_letter_stats refreshes the stats when words are pruned
+    STATS_FULL        = 'full'        # recompute from the remaining words
+    STATS_INCREMENTAL = 'incremental' # subtract the removed words
+    STATS_AUTO        = 'auto'        # whichever touches fewer words
+
     def __init__(self, args):
         args = dotdict(args)
 
-        self.wordlen   = args.wordlen
-        self.wordle    = Wordle(args.dict, args.wordlen)
-        self.iteration = 0     # what attempt are we on
-        self.pattern   = ['.'] * self.wordlen
+        self.wordlen    = args.wordlen
+        self.wordle     = Wordle(args.dict, args.wordlen, matrix=args.get('matrix', False))
+        self.stats      = args.get('stats') or self.STATS_AUTO
+        self.iteration  = 0     # what attempt are we on
+        self.constraint = Constraint(self.wordlen) # everything the responses told us
+        self.hard       = args.get('hard', False)
+        self.hints      = Constraint(self.wordlen) # what hard mode guesses must use
+        self.history    = []    # [(guess, response)] since the full dictionary
+        self.decisions  = DecisionCache(args.get('cache_size', DecisionCache.MAXSIZE))
+        self.tree       = None  # a loaded DecisionTree
+
+        strategy        = STRATEGIES[args.get('strategy') or HeuristicStrategy.name]
+        self.strategy   = strategy(self, args.get('pool'))
 
         self.update_letter_stats()
+        self._root_stats = self.letter_stats()
+
+    def reset(self):
+        """
+        forget every response and start over with the whole dictionary,
+        its letter stats are restored rather than recounted
+        """
+        self.iteration  = 0
+        self.constraint = Constraint(self.wordlen)
+        self.hints      = Constraint(self.wordlen)
+        self.history    = []
+
+        self.wordle.words = self.wordle.dictionary
+        self.set_letter_stats(self._root_stats)
+
+    def letter_stats(self):
+        """
+        a copy of the current letter stats, see set_letter_stats
+        """
+        return (
+            self._letter_counts.copy(),
+            [counts.copy() for counts in self._letter_pos],
+            self._pair_counts.copy(),
+            self._letter_dist,
+            self._pair_total,
+        )
+
+    def set_letter_stats(self, stats):
+        """
+        restore stats from letter_stats, copied again as the counters are
+        updated in place
+        """
+        counts, pos, pairs, self._letter_dist, self._pair_total = stats
+        self._letter_counts = counts.copy()
+        self._letter_pos = [c.copy() for c in pos]
+        self._pair_counts = pairs.copy()
+
+    @classmethod
+    def stats_modes(cls):
+        return [cls.STATS_AUTO, cls.STATS_FULL, cls.STATS_INCREMENTAL]
 
     @property
     def words(self):
@@ -26,70 +85,119 @@ class Solver:
 
     @words.setter
     def words(self, words):
+        prev = self.wordle.words
         self.wordle.words = words
-        self.update_letter_stats()
+
+        if self.words <= prev:
+            self.update_letter_stats(removed=prev - self.words)
+        else:
+            self.update_letter_stats()
 
     @property
     def length(self):
         return len(self.words)
 
-    def update_letter_stats(self):
+    def update_letter_stats(self, removed=None):
+        """
+        refresh the letter stats of the current words, if given the removed words
+        the stats may be updated by subtracting their contributions
+        """
         if not self.words:
             return
 
-        self._letter_counts = self.letter_counts(self.words)
-        self._letter_dist = self.letter_distribution(self.words)
-        self._letter_pairs = self.letter_pairs(self.words)
+        if removed is None or not self._incremental(removed):
+            self._letter_counts = self.letter_counts(self.words)
+            self._letter_pos = self.letter_positions(self.words)
+            self._pair_counts = self.pair_counts(self.words)
+        else:
+            self._letter_counts.subtract(self.letter_counts(removed))
+            self._pair_counts.subtract(self.pair_counts(removed))
+
+            for counts, removed_counts in zip(self._letter_pos, self.letter_positions(removed)):
+                counts.subtract(removed_counts)
+
+            # drop the letters and pairs that no longer occur
+            self._letter_counts = +self._letter_counts
+            self._pair_counts = +self._pair_counts
+
+        self._letter_dist = self.distribution(self._letter_pos, len(self.words))
+        self._pair_total = sum(self._pair_counts.values())
+
+    def _incremental(self, removed):
+        if self.stats == self.STATS_INCREMENTAL:
+            return True
+
+        if self.stats == self.STATS_AUTO:
+            return len(removed) < len(self.words)
+
+        return False
 
     def letter_counts(self, words):
         """
         count number of times each letter occurs in all words
         """
-        counts = collections.defaultdict(int)
+        counts = collections.Counter()
 
         for word in words:
-            for c in word:
-                counts[c] += 1
+            counts.update(word)
 
         return counts
 
+    def letter_positions(self, words):
+        """
+        count of each letter at each position
+        pos[0]['a'] = 12 # 12 words start with 'a'
+        """
+        pos = [collections.Counter() for _ in range(self.wordlen)]
+
+        # zip(*words) transposes the word list into one column per position
+        for i, column in enumerate(zip(*words)):
+            pos[i].update(column)
+
+        return pos
+
+    def distribution(self, pos, total):
+        """
+        convert letter_positions counts to letter_distribution percentages
+        """
+        dist = collections.defaultdict(lambda: [0] * self.wordlen)
+
+        for i, counts in enumerate(pos):
+            for c in string.ascii_lowercase:
+                dist[c][i] = counts[c] / total
+
+        return dist
+
     def letter_distribution(self, words):
         """
         return a dict with letter percentages of each location
         dist['a'][0] = .02 # 2% of words start with 'a'
         dist['a'][4] = .02 # 2% of words end with 'a'
         """
-        def count_matches(words, pattern):
-            return sum([
-                1 for word in words if pattern.match(word)
-            ])
-
-        dist = collections.defaultdict(lambda: [0] * self.wordlen)
+        return self.distribution(self.letter_positions(words), len(words))
 
-        for c in range(26):
-            c = chr(ord('a') + c)
+    @staticmethod
+    def word_pairs(word):
+        """
+        unique letter pairs in word
+        """
+        return {word[i:i + 2] for i in range(len(word) - 1)}
 
-            for i in range(self.wordlen):
-                pattern = '.' * self.wordlen
-                pattern = splice(pattern, i, c)
-                pattern = re.compile(pattern)
-                matches = count_matches(self.words, pattern)
+    def pair_counts(self, words):
+        """
+        count the number of words each letter pair occurs in, walks each word once.
+        the Counter can be updated incrementally with update() and subtract()
+        """
+        counts = collections.Counter()
 
-                dist[c][i] = matches / len(words)
+        for word in words:
+            counts.update(self.word_pairs(word))
 
-        return dist
+        return counts
 
     def letter_pairs(self, words):
-        counts = collections.defaultdict(int)
-
-        for a in string.ascii_lowercase:
-            for b in string.ascii_lowercase:
-                for word in words:
-                    pair = f"{a}{b}"
-                    if pair in word:
-                        counts[pair] += 1
-
-        pairs = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+        counts = self.pair_counts(words)
+        pairs = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
         return pairs
 
     def word_score(self, word):
@@ -108,32 +216,34 @@ class Solver:
         score *= 1 + pos
 
         # check if word has common letter pairs in it. eg. ee, ch
-        pair_score = sum([self._letter_pairs[pair] for pair in pair_generator(word)])
-        pair_score /= sum([v for k, v in self._letter_pairs.items()])
+        pair_score = sum([self._pair_counts[pair] for pair in pair_generator(word)])
+        pair_score /= self._pair_total
         score *= 1 + pair_score
 
         return score
 
-    def find_matches(self, exact, contains, excludes):
+    def valid_guess(self, guess):
         """
-        "exact" is a bit of a misnomer, it's anything or exact
+        in hard mode a guess must use every hint revealed so far
         """
-        matches = set()
-        exact = re.compile(exact)
+        return not self.hard or self.hints.matches(guess)
 
-        for word in self.words:
-            if all([
-                exact.match(word),
-                all([c in word for c in contains]),
-                not any([c in word for c in excludes])
-            ]):
-                matches.add(word)
+    def find_matches(self, constraint):
+        """
+        current words that satisfy the constraint
+        """
+        return self.wordle.store.subset(constraint.filter(self.wordle.store, self.words.bits))
 
-        return matches
+    @staticmethod
+    def suggestion_key(item):
+        """
+        sort key of a (word, score) suggestion, see get_suggestions
+        """
+        return (-item[1], item[0])
 
-    def get_suggestions(self):
+    def get_suggestions(self, k=None):
         """
-        some hints of good words to the user
+        some hints of good words to the user, only the best k if given
         """
 
         # NOTE: the sorted function below warrants an explanation. It turns out
@@ -145,77 +255,77 @@ class Solver:
         # of rerverse=True but the actual words are then sorted in alphabetical
         # order.
 
-        suggestions = [(word, self.word_score(word)) for word in self.words]
-        suggestions = sorted(suggestions, key=lambda item: (-item[1], item[0]), reverse=False)
+        suggestions = self.strategy.scores(self.strategy.guesses())
+
+        if k is not None:
+            # partial selection, no need to sort words we'll never look at
+            return heapq.nsmallest(k, suggestions, key=self.suggestion_key)
+
+        suggestions = sorted(suggestions, key=self.suggestion_key, reverse=False)
+
+        return suggestions
+
+    def next_suggestions(self):
+        """
+        the TOP suggestions for the current round, from the decision tree if
+        loaded (with no score) or the decision cache before scoring words
+        """
+        if self.tree is not None:
+            guess = self.tree.get(self.history)
+            if guess is not None:
+                return [(guess, None)]
+
+        suggestions = self.decisions.get(self.history)
+
+        if suggestions is None:
+            suggestions = self.get_suggestions(self.TOP)
+            self.decisions.put(self.history, suggestions)
 
         return suggestions
 
+    def iter_suggestions(self):
+        """
+        lazily yield the same suggestions as get_suggestions, the words
+        are only ordered as far as the caller consumes them
+        """
+        heap = [(-score, word) for word, score in self.strategy.scores(self.strategy.guesses())]
+        heapq.heapify(heap)
+
+        while heap:
+            score, word = heapq.heappop(heap)
+            yield word, -score
+
     def parse_response(self, guess, resp):
-        def _elsewhere(p, c):
-            """
-            make a regex pattern
-            .    -> [^c]
-            [^c] -> [^cd]
-            """
-            if p == '.':
-                return f"[^{c}]"
-
-            chars = p[2:-1]
-            return f"[^{chars}{c}]"
-
-        contains = ''
-        excludes = ''
-
-        # handle exact matches first
-        for i, r in enumerate(resp):
-            if r == Wordle.LETTER_EXACT:
-                c = guess[i]
-                self.pattern[i] = c
-                contains += c
-
-        for i, r in enumerate(resp):
-            c = guess[i]
-
-            if r == Wordle.LETTER_IN:
-                contains += c
-                self.pattern[i] = _elsewhere(self.pattern[i], c)
-
-            elif r == Wordle.LETTER_OUT:
-                # wordle responds with OUT on second instance of a letter if letter only appears
-                # once in the word, make sure we don't exclude that letter for future consideration
-                # eg. word: mourn, guess: moron -> eeioe
-                # print(f"{resp=}, {i=}, {r=}, {c=}, {contains=}, {excludes=}, {self.pattern}")
-                if c not in contains:
-                    excludes += c
-                else:
-                    # if our guess has a given letter twice but it only appears once in the answer
-                    # then do this weaker exclusion.
-                    # eg. word: hatch, guess: catch -> oeeee
-                    self.pattern[i] = _elsewhere(self.pattern[i], c)
-
-        contains = ''.join(set(contains))
-        exact = ''.join(self.pattern)
-        # print(f"{guess=}, {resp=}, {exact=}, {contains=}, {excludes=}, {self.pattern}")
-        return exact, contains, excludes
+        """
+        add what the response tells us to the accumulated constraint, this
+        includes letter counts so when a guess has a repeated letter we know
+        exactly how many times it's in the word.
+        eg. word: hatch, guess: catch -> oeeee, exactly one c and not first
+        """
+        self.constraint.update(guess, resp)
+        self.hints.update(guess, resp, hard=True)
+        return self.constraint
 
     def prune_words(self, guess, resp):
         """
         given a guess and a wordle response, prune our current
         word list to exclude impossible answers
         """
-        exact, contains, excludes = self.parse_response(guess, resp)
-        self.words = self.find_matches(exact, contains, excludes)
+        constraint = self.parse_response(guess, resp)
+        self.words = self.find_matches(constraint)
+        self.history.append((guess, resp))
 
     def solve(self, word, guesses=None, callback=None):
         """
         given a word, show the steps the solver takes to find it
         """
         self.iteration = 0
+        found_resp = Wordle.LETTER_EXACT * self.wordlen
 
         while self.length >= 1:
             self.iteration += 1
             curr_len        = self.length
-            suggestions     = self.get_suggestions()
+            suggestions     = self.next_suggestions()
 
             if guesses:
                 guess = guesses.pop(0)
@@ -234,3 +344,8 @@ class Solver:
                     guess=guess,
                     resp=resp
                 )
+
+            if resp == found_resp:
+                break
+
+        return self.iteration
@@ -1,3 +1,4 @@
+import time
 import pathlib
 import itertools
 
@@ -11,6 +12,10 @@ from lib.wordle import Wordle
 from lib.wordleui import WordleUI
 from lib.utils import dotdict
 from lib.solver import Solver
+from lib.strategy import STRATEGIES, Strategy
+from lib.bench import Bench, OpenerSearch, MAX_ROUNDS
+from lib.decisions import DecisionCache, DecisionTree
+from lib.multi import MultiSolver
 
 def to_list(ctx, param, value):
     return list(value)
@@ -21,10 +26,36 @@ class SolverUI:
         args = dotdict(args)
 
         self.args    = args
-        self.solver  = Solver(args)
         self.wordlen = args.wordlen
 
-    def print_group(self, words, n=10):
+        try:
+            self.solver = Solver(args)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+
+        if args.tree:
+            self.solver.tree = self.load_tree(args.tree)
+
+    def load_tree(self, path):
+        """
+        load a decision tree built for our dictionary and mode, it's only a
+        warning if it was built with another strategy or pool
+        """
+        try:
+            tree = DecisionTree.load(path, self.solver.wordle, self.solver.hard)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+
+        strategy = self.solver.strategy
+        for key, value in [('strategy', strategy.name), ('pool', strategy.pool)]:
+            if tree.meta.get(key, value) != value:
+                print(f"warning: {path} was built with --{key} {tree.meta[key]}, not {value}")
+
+        return tree
+
+    def print_group(self, words, n=10, format=None):
+        format = format or self.solver.strategy.format
+
         if not n:
             n = len(words)
 
@@ -35,7 +66,7 @@ class SolverUI:
             if i >= n:
                 break
 
-            print(f"{int(k)}: {', '.join([k for k, _ in v])}")
+            print(f"{format(k)}: {', '.join([k for k, _ in v])}")
 
     def print_letter_counts(self):
         by_letter = sorted(self.solver._letter_counts.items())
@@ -83,6 +114,10 @@ class SolverUI:
                 print("invalid guess, try again")
                 continue
 
+            if not self.solver.valid_guess(word):
+                print("hard mode: your guess must use every hint, try again")
+                continue
+
             return word
 
     def get_response(self):
@@ -122,7 +157,7 @@ class SolverUI:
         print(f"dict: {curr_len:4}: {', '.join([v for v,c in suggestions[:6]])}")
 
         if resp == found_resp:
-            print(f"word is: {words.pop()}")
+            print(f"word is: {guess}")
         elif len(words) == 0:
             print("our word list is now empty, we don't know the word")
 
@@ -131,7 +166,7 @@ class SolverUI:
         length = self.solver.length
 
         if length == 1:
-            print(f"word must be: {self.solver.words.pop()}")
+            print(f"word must be: {next(iter(self.solver.words))}")
             raise SystemExit
 
         if length == 0:
@@ -140,13 +175,136 @@ class SolverUI:
 
         print(f"current word list length: {length}")
 
-        suggestions = self.solver.get_suggestions()
-        self.print_group(suggestions, 5)
+        if self.solver.tree is not None and (guess := self.solver.tree.get(self.solver.history)):
+            print(f"suggestion: {guess}")
+        else:
+            suggestions = self.solver.iter_suggestions()
+            self.print_group(suggestions, 5)
 
         guess = self.get_guess()
         resp = self.get_response()
         self.solver.prune_words(guess, resp)
 
+    def build_tree(self, path):
+        """
+        build the decision tree for every answer and save it to path
+        """
+        start = time.perf_counter()
+        tree = DecisionTree.build(self.solver)
+        tree.save(path)
+
+        print(f"saved {len(tree)} decisions to {path} in {time.perf_counter() - start:.1f}s")
+
+    def bench(self):
+        """
+        solve every dictionary word (or a sample) and show how the solver did,
+        WORD and GUESSES are used as forced opening guesses
+        """
+        bench = Bench(self.args, self.args.workers, self.solver)
+        words = bench.words(self.args.sample)
+        guesses = list(filter(None, [self.args.word] + self.args.guesses))
+
+        print(f"solving {len(words)} words with {bench.workers} workers")
+        result = bench.run(words, guesses)
+        histogram = result.histogram
+        width = max(histogram.values())
+
+        for rounds in range(1, max(histogram) + 1):
+            count = histogram[rounds]
+            bar = '#' * (count * 50 // width)
+            print(f"{rounds:2}: {count:5} {bar}")
+
+        print(f"mean guesses: {result.mean:.3f}")
+        print(f"failed (>{MAX_ROUNDS} rounds): {len(result.failures)} ({result.failure_rate:.2%})")
+        print(f"decision cache: {result.hits} hits, {result.misses} misses ({result.hit_rate:.1%})")
+        print(f"took {result.elapsed:.1f}s, {result.throughput:.1f} words/s")
+
+    def search_first(self):
+        """
+        find the opener with the lowest mean rounds over every answer (or a sample)
+        """
+        bench = Bench(self.args, self.args.workers, self.solver)
+        openers = [word for word, _score in self.solver.get_suggestions(self.args.openers)]
+
+        try:
+            search = OpenerSearch(bench, self.args.checkpoint)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+
+        size = len(self.solver.wordle.dictionary)
+        if self.args.sample:
+            size = min(size, self.args.sample)
+
+        # resuming reuses the checkpoint's answers, so a --sample is the same sample
+        answers = search.answers or bench.words(self.args.sample)
+        if len(answers) != size:
+            raise click.UsageError(f"checkpoint {self.args.checkpoint} was made with {len(answers)} answers")
+
+        count = itertools.count(len([o for o in openers if o in search.results]) + 1)
+
+        def progress(opener, mean, worst, solved):
+            if mean is None:
+                result = f"pruned after {solved} answers"
+            else:
+                result = f"mean: {mean:.3f}, worst: {worst}"
+            print(f"{next(count):5}/{len(openers)} {opener}: {result}, best: {search.best or 0:.3f}")
+
+        print(f"evaluating {len(openers)} openers against {len(answers)} answers with {bench.workers} workers")
+        ranking = search.run(openers, answers, progress)
+
+        print("best openers:")
+        for opener, mean, worst in ranking[:10]:
+            print(f"{opener}: mean: {mean:.3f}, worst: {worst}")
+
+    def cb_boards(self, *args, **kw):
+        iteration   = kw['iteration']
+        suggestions = kw['suggestions']
+        guess       = kw['guess']
+
+        print(f"round {iteration}: guess: {guess}, {', '.join([v for v,c in suggestions[:6]])}")
+
+        for board, resp in zip(kw['boards'], kw['responses']):
+            print(f"  board {board + 1}: {WordleUI.colorize_word(resp, guess)}")
+
+    def solve_boards(self):
+        """
+        solve --boards puzzles at once, automatically given a word per board
+        """
+        try:
+            multi = MultiSolver(self.solver.wordle, self.args.boards, self.args.pool)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        words = list(filter(None, [self.args.word] + self.args.guesses))
+
+        if words:
+            if len(words) != self.args.boards:
+                print(f"need {self.args.boards} words, one per board")
+                return
+
+            rounds = multi.solve(words, self.cb_boards)
+            print(f"solved {len(words)} boards in {rounds} rounds")
+            return
+
+        while unsolved := multi.unsolved:
+            for i, board in enumerate(multi.boards):
+                if not board.solved:
+                    print(f"board {i + 1}: {len(board.words)} words")
+
+            if not all(board.words for board in unsolved):
+                print("a board's word list is now empty, we don't know the word")
+                return
+
+            self.print_group(multi.get_suggestions(5), 5, lambda score: f"{score:.3f}")
+
+            guess = self.get_guess()
+            responses = []
+            for i, board in enumerate(multi.boards):
+                if not board.solved:
+                    print(f"board {i + 1}")
+                    responses.append(self.get_response())
+
+            multi.prune_words(guess, responses)
+
     def solve(self):
 
         if self.args.score:
@@ -158,8 +316,24 @@ class SolverUI:
             print()
             return
 
+        if self.args.boards:
+            self.solve_boards()
+            return
+
+        if self.args.build_tree:
+            self.build_tree(self.args.build_tree)
+            return
+
+        if self.args.search_first:
+            self.search_first()
+            return
+
+        if self.args.bench:
+            self.bench()
+            return
+
         if self.args.first:
-            suggestions = self.solver.get_suggestions()
+            suggestions = self.solver.iter_suggestions()
             self.print_group(suggestions, 10)
             return
 
@@ -194,6 +368,21 @@ class SolverUI:
 @click.option('--score', metavar='word [word]', help="show word score")
 @click.option('--pos', metavar='letter', help="show distribution of letter")
 @click.option('--pairs', is_flag=True, help="show most common pairs of letters")
+@click.option('--matrix', is_flag=True, help="precompute all responses")
+@click.option('--bench', is_flag=True, help="solve every word and show stats")
+@click.option('--sample', type=int, help="bench a random sample of words")
+@click.option('--workers', type=int, help="bench worker processes")
+@click.option('--build-tree', metavar='file', type=click.Path(path_type=pathlib.Path), help="save the decision for every answer")
+@click.option('--tree', metavar='file', type=click.Path(exists=True, readable=True, path_type=pathlib.Path), help="suggest guesses from a saved decision tree")
+@click.option('--search-first', is_flag=True, help="find the opener with the fewest mean guesses")
+@click.option('--openers', type=int, help="only search the n best scoring openers")
+@click.option('--checkpoint', metavar='file', type=click.Path(path_type=pathlib.Path), help="resumable search results")
+@click.option('--cache-size', default=DecisionCache.MAXSIZE, type=int, help="decisions to remember, 0 to disable")
+@click.option('--strategy', default='heuristic', type=click.Choice(list(STRATEGIES)), help="how guesses are scored")
+@click.option('--pool', default=Strategy.POOL_CANDIDATES, type=click.Choice(Strategy.pools()), help="where guesses are drawn from")
+@click.option('--boards', type=int, help="solve n boards at once, eg. 4 for quordle")
+@click.option('--hard', is_flag=True, help="only guess words that use every hint")
+@click.option('--stats', default=Solver.STATS_AUTO, type=click.Choice(Solver.stats_modes()), help="how letter stats are updated")
 @click.argument('word', required=False, nargs=1)
 @click.argument('guesses', required=False, nargs=-1, callback=to_list)
 @click.pass_context
@@ -0,0 +1,100 @@
+import math
+import collections
+
+
+class Strategy:
+    """
+    how a Solver scores its guesses, a higher score is a better guess
+    """
+
+    name = None
+
+    # where guesses are drawn from
+    POOL_CANDIDATES = 'candidates' # words that could still be the answer
+    POOL_DICTIONARY = 'dictionary' # every word, may split the candidates better
+
+    def __init__(self, solver, pool=None):
+        self.solver = solver
+        self.pool   = pool or self.POOL_CANDIDATES
+
+    @classmethod
+    def pools(cls):
+        return [cls.POOL_CANDIDATES, cls.POOL_DICTIONARY]
+
+    def guesses(self):
+        """
+        the words we consider guessing, in hard mode only those using every hint
+        """
+        if self.pool == self.POOL_DICTIONARY:
+            words = self.solver.wordle.dictionary
+        else:
+            words = self.solver.words
+
+        if self.solver.hard:
+            store = self.solver.wordle.store
+            words = store.subset(self.solver.hints.filter(store, words.bits))
+
+        return words
+
+    def scores(self, guesses):
+        """
+        yield (word, score) for each guess
+        """
+        raise NotImplementedError
+
+    def format(self, score):
+        return str(int(score))
+
+
+class HeuristicStrategy(Strategy):
+    """
+    Solver.word_score, mix of letter counts, positions and pairs
+    """
+
+    name = 'heuristic'
+
+    def scores(self, guesses):
+        for word in guesses:
+            yield word, self.solver.word_score(word)
+
+
+class EntropyStrategy(Strategy):
+    """
+    expected information, in bits, of the response to a guess.
+
+    a guess splits the candidates into groups by the response each would
+    give, the more even the split the more we learn. ties go to guesses that
+    could be the answer.
+    """
+
+    name = 'entropy'
+
+    def __init__(self, solver, pool=None):
+        super().__init__(solver, pool)
+
+        # scoring every guess against every candidate without it is just as slow
+        solver.wordle.require_matrix()
+
+    @staticmethod
+    def entropy(counts, total):
+        return math.log2(total) - sum(c * math.log2(c) for c in counts) / total
+
+    def scores(self, guesses):
+        candidates = self.solver.words
+        total = len(candidates)
+
+        for word, codes in self.solver.wordle.bulk_response_codes(guesses, candidates):
+            score = self.entropy(collections.Counter(codes).values(), total)
+            if word in candidates:
+                score += 1 / total
+
+            yield word, score
+
+    def format(self, score):
+        return f"{score:.3f}"
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in [HeuristicStrategy, EntropyStrategy]
+}
@@ -20,3 +20,43 @@ class classproperty(object):
 
     def __get__(self, owner_self, owner_cls):
         return self.fget(owner_cls)
+
+def popcount(bits):
+    """
+    number of set bits in a bitset
+    """
+    return bin(bits).count('1')
+
+def bit_ids(bits):
+    """
+    list the index of every set bit in a bitset, lowest first
+    """
+    bits = bin(bits)[:1:-1] # lowest bit first, without the 0b prefix
+    count = bits.count('1')
+
+    # scanning every digit is quicker for dense sets, find() for sparse ones
+    if count * 32 > len(bits):
+        return [i for i, b in enumerate(bits) if b == '1']
+
+    ret = []
+    i = bits.find('1')
+
+    while i != -1:
+        ret.append(i)
+        i = bits.find('1', i + 1)
+
+    return ret
+
+def ids_to_bits(ids):
+    """
+    bitset with the given bits set, the inverse of bit_ids
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+
+    digits = bytearray(b'0' * (max(ids) + 1))
+    for i in ids:
+        digits[i] = ord('1')
+
+    return int(digits[::-1], 2)
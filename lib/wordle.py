@@ -1,5 +1,11 @@
 
-from .utils import splice
+import operator
+import functools
+import collections
+
+from .utils import splice, ids_to_bits
+from .responses import ResponseMatrix, response_code, OUT, IN, EXACT
+from .wordstore import WordStore, LETTERS
 
 class Wordle:
 
@@ -7,9 +13,22 @@ class Wordle:
     LETTER_OUT   = 'o' # out, not in word
     LETTER_EXACT = 'e' # exact spot
 
-    def __init__(self, dictpath, wordlen):
-        self.wordlen = wordlen
-        self.words = self.read_dict(dictpath, wordlen)
+    # response letter to its base 3 digit in a response code
+    DIGITS = {LETTER_OUT: OUT, LETTER_IN: IN, LETTER_EXACT: EXACT}
+
+    # building the matrix is n**2, past this many words only build_matrix does it
+    MATRIX_LIMIT = 10000
+
+    def __init__(self, dictpath, wordlen, matrix=False):
+        self.wordlen    = wordlen
+        self.dictpath   = dictpath
+        self.store      = self.read_dict(dictpath, wordlen)
+        self.dictionary = self.store.all # full word list, words gets pruned
+        self.words      = self.dictionary
+        self.matrix     = None
+
+        if matrix:
+            self.build_matrix()
 
     @property
     def words(self):
@@ -20,7 +39,8 @@ class Wordle:
 
     @words.setter
     def words(self, words):
-        self._words = words
+        # any iterable of words is stored as a WordSet of our dictionary
+        self._words = self.store.subset(words)
 
     @property
     def length(self):
@@ -34,6 +54,40 @@ class Wordle:
             cls.LETTER_EXACT,
         ])
 
+    @classmethod
+    @functools.lru_cache()
+    def responses(cls, wordlen):
+        """
+        every response string of wordlen indexed by its response code
+        """
+        digits = [cls.LETTER_OUT, cls.LETTER_IN, cls.LETTER_EXACT]
+        responses = ['']
+
+        for _ in range(wordlen):
+            responses = [resp + d for d in digits for resp in responses]
+
+        return responses
+
+    @classmethod
+    def decode(cls, code, wordlen):
+        """
+        convert a response code to a response string
+        """
+        return cls.responses(wordlen)[code]
+
+    @classmethod
+    def encode(cls, resp):
+        """
+        convert a response string to a response code, the inverse of decode
+        """
+        code = 0
+
+        # position 0 is the least significant digit
+        for c in reversed(resp):
+            code = code * 3 + cls.DIGITS[c]
+
+        return code
+
     @classmethod
     def read_dict(cls, dictpath, wordlen):
         dictionary = dictpath.open().read().splitlines()
@@ -46,17 +100,146 @@ class Wordle:
                 len(word) == wordlen,       # 5 letters long
                 # turns out you can have repeat letters
                 # len(set(word)) == wordlen,  # 5 unique letters, not the same as above, eg. otter
-                word == word.lower()        # no capitals
+                word == word.lower(),       # no capitals
+                set(word) <= set(LETTERS),  # no punctuation or accents
             ]):
                 words.add(word)
 
         # logger.debug(f"our word list contains {len(words)}, {wordlen} letter words")
         assert words, f"our dictionary is empty after reading file: {dictpath}"
-        return words
+        return WordStore(words, wordlen)
+
+    def build_matrix(self, cache=True):
+        """
+        precompute the response of every guess against every word in the dictionary,
+        by default the matrix is loaded from (or saved to) the on disk cache
+        """
+        if cache:
+            self.matrix = ResponseMatrix.cached(self.dictionary, self.wordlen, source=self.dictpath)
+        else:
+            self.matrix = ResponseMatrix(self.dictionary, self.wordlen)
+
+        return self.matrix
+
+    def require_matrix(self):
+        """
+        the response matrix, from the cache or built (and cached) the first time.
+        raises ValueError if the dictionary is too large to build it implicitly
+        """
+        if self.matrix is None:
+            build = len(self.dictionary) <= self.MATRIX_LIMIT
+            self.matrix = ResponseMatrix.cached(self.dictionary, self.wordlen, build=build, source=self.dictpath)
+
+        if self.matrix is None:
+            raise ValueError(f"the response matrix of {len(self.dictionary)} words isn't cached, build it with --matrix")
+
+        return self.matrix
+
+    def check_all(self, word):
+        """
+        response code of every dictionary word guessed against word, indexed by id
+        """
+        if self.matrix is not None and word in self.matrix:
+            return self.matrix.column(self.matrix.ids[word])
+
+        return [response_code(word, guess) for guess in self.store]
+
+    def bulk_response_codes(self, guesses, words):
+        """
+        yield (guess, codes) for each guess, codes are the response codes of
+        words (any collection of dictionary words) in id order. with the matrix
+        each guess is a single row read, the columns are picked in one call
+        """
+        for guess, (codes,) in self.bulk_response_codes_multi(guesses, [words]):
+            yield guess, codes
+
+    def bulk_response_codes_multi(self, guesses, word_sets):
+        """
+        yield (guess, [codes, ...]) for each guess, the codes of each of several
+        word collections as in bulk_response_codes. with the matrix each guess's
+        row is read once and every collection picks its own columns from it
+        """
+        sets = [self.store.subset(words) for words in word_sets]
+
+        if self.matrix is None:
+            candidates = [[self.store[i] for i in words.ids] for words in sets]
+            for guess in guesses:
+                yield guess, [[response_code(word, guess) for word in words] for words in candidates]
+            return
+
+        matrix = self.matrix
+        picks = [self._pick(words) for words in sets]
+
+        for guess in guesses:
+            guess_id = matrix.ids.get(guess)
+
+            if guess_id is None:
+                yield guess, [[response_code(self.store[i], guess) for i in words.ids] for words in sets]
+                continue
+
+            row = matrix.row(guess_id)
+            yield guess, [row if pick is None else pick(row) for pick in picks]
+
+    def _pick(self, words):
+        """
+        function picking the columns of words (a WordSet) from a matrix row,
+        None when that's the whole row
+        """
+        ids = words.ids
+
+        # matrix ids are the same as the store ids, both are the sorted dictionary
+        if words == self.dictionary:
+            return None
+        if len(ids) == 1:
+            only = ids[0]
+            return lambda row: (row[only],)
+        if ids:
+            return operator.itemgetter(*ids)
+        return lambda row: ()
+
+    def response_codes(self, guess, words):
+        """
+        response codes of words, in id order, to guess
+        """
+        for _guess, codes in self.bulk_response_codes([guess], words):
+            return codes
+
+    def bulk_partition(self, guesses, words):
+        """
+        yield (guess, buckets) for each guess, see partition
+        """
+        ids = self.store.subset(words).ids
+
+        for guess, codes in self.bulk_response_codes(guesses, words):
+            buckets = collections.defaultdict(list)
+
+            for word_id, code in zip(ids, codes):
+                buckets[code].append(word_id)
+
+            yield guess, {code: self.store.subset(ids_to_bits(bucket)) for code, bucket in buckets.items()}
+
+    def partition(self, guess, words):
+        """
+        split words by the response each would give to guess,
+        {response code: WordSet}
+        """
+        for _guess, buckets in self.bulk_partition([guess], words):
+            return buckets
 
     def check_word(self, word, guess):
         """
         return a response for the given guess
+        """
+        if self.matrix is not None:
+            code = self.matrix.code(word, guess)
+            if code is not None:
+                return self.decode(code, self.wordlen)
+
+        return self.splice_word(word, guess)
+
+    def splice_word(self, word, guess):
+        """
+        build the response for the given guess one letter at a time
 
         NOTE: not completely sure this response matches official version in the case
         where there are multiple matches of the same letter.
@@ -1,10 +1,12 @@
 import pathlib
 import random
+import itertools
 
 import click
 
 from .wordle import Wordle
 from .utils import dotdict
+from .constraint import Constraint
 
 from rich.console import Console
 _print = print
@@ -48,8 +50,9 @@ class WordleUI:
         args = dotdict(args)
 
         self.args   = args
-        self.wordle = Wordle(args.dict, args.wordlen)
+        self.wordle = Wordle(args.dict, args.wordlen, matrix=args.get('matrix', False))
         self.rounds = [] # [guess, response]
+        self.hints  = Constraint(args.wordlen) # hard mode, what guesses must use
 
     @property
     def wordlen(self):
@@ -60,9 +63,12 @@ class WordleUI:
             if len(word) != self.wordlen:
                 return "wrong word length"
 
-            if word not in self.wordle.words:
+            if word not in self.wordle.dictionary:
                 return "your guess is not in dictionary"
 
+            if self.args.hard and not self.hints.matches(word):
+                return "hard mode, your guess must use every hint"
+
             return None
 
         while True:
@@ -105,22 +111,51 @@ class WordleUI:
 
     def pick_word(self, words):
         # can't random.choice from a set so use this hack
-        return random.sample(words, 1)[0]
+        return random.choice(list(words))
+
+    def adversary_response(self, guess):
+        """
+        absurdle, never commit to a word. respond with whatever leaves the most
+        words (then the fewest hints) and keep those words as possible answers
+        """
+        def _key(item):
+            code, words = item
+            resp = Wordle.decode(code, self.wordlen)
+            return (len(words), -resp.count(Wordle.LETTER_EXACT), -resp.count(Wordle.LETTER_IN), -code)
+
+        buckets = self.wordle.partition(guess, self.wordle.words)
+        code, words = max(buckets.items(), key=_key)
+
+        self.wordle.words = words
+        self.word = next(iter(words)) # only the answer if the response is all exact
+
+        return Wordle.decode(code, self.wordlen)
 
     def play(self):
 
-        if self.args.start_word:
+        if self.args.absurd:
+            self.word = None
+            print("I'm thinking of a word, or am I? what's your guess?")
+        elif self.args.start_word:
             self.word = self.args.start_word
             print(f"using given word: {self.args.start_word}")
         else:
             self.word = self.pick_word(self.wordle.words)
             print("I picked a word, what's your guess?")
 
-        for i in range(6):
+        # absurdle has no limit on the number of tries
+        tries = itertools.count() if self.args.absurd else range(6)
+
+        for i in tries:
             guess = self.get_guess()
-            resp = self.wordle.check_word(self.word, guess)
+
+            if self.args.absurd:
+                resp = self.adversary_response(guess)
+            else:
+                resp = self.wordle.check_word(self.word, guess)
 
             self.rounds.append([guess, resp])
+            self.hints.update(guess, resp, hard=True)
             self.show_rounds()
 
             if resp == Wordle.LETTER_EXACT * self.wordlen:
@@ -128,12 +163,15 @@ class WordleUI:
                 self.show_summary()
                 return
 
-        print(f"[bold yellow]You ran out of tries. The word was: [blue]{self.wordle.word}[/blue][/bold yellow]")
+        print(f"[bold yellow]You ran out of tries. The word was: [blue]{self.word}[/blue][/bold yellow]")
         self.show_summary()
 
 @click.command()
 @click.option('--dict', default='dictionary.txt', type=click.Path(exists=True, readable=True, path_type=pathlib.Path))
 @click.option('--len', 'wordlen', default=5)
+@click.option('--matrix', is_flag=True, help="precompute all responses")
+@click.option('--hard', is_flag=True, help="guesses must use every hint")
+@click.option('--absurd', is_flag=True, help="adversarial mode, the word changes to dodge your guesses")
 @click.argument('start_word', required=False) # text="use this word instead of a random one")
 @click.pass_context
 def cli(ctx, *args, **kw):
@@ -0,0 +1,177 @@
+import string
+import functools
+import collections.abc
+
+from .utils import popcount, bit_ids, ids_to_bits
+
+LETTERS = string.ascii_lowercase
+
+
+class WordStore:
+    """
+    an immutable word list indexed by letter
+
+    words are sorted and a word's id is its index. the positions and counts
+    letter indexes are bitsets of ids, built on first use
+    """
+
+    def __init__(self, words, wordlen):
+        self.wordlen = wordlen
+        self.words   = tuple(sorted(set(words)))
+        self.ids     = {word: i for i, word in enumerate(self.words)}
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __contains__(self, word):
+        return word in self.ids
+
+    def __getitem__(self, word_id):
+        return self.words[word_id]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {len(self)} words>"
+
+    @property
+    def all(self):
+        """
+        every word in the store as a WordSet
+        """
+        return WordSet(self, (1 << len(self.words)) - 1)
+
+    @functools.cached_property
+    def positions(self):
+        """
+        index of words by letter position, positions[i][c] is the bitset of
+        words with letter code c at position i
+        """
+        ids = [[[] for _ in LETTERS] for _ in range(self.wordlen)]
+
+        for word_id, word in enumerate(self.words):
+            for i, c in enumerate(word):
+                ids[i][ord(c) - ord('a')].append(word_id)
+
+        return [[ids_to_bits(letter) for letter in position] for position in ids]
+
+    @functools.cached_property
+    def counts(self):
+        """
+        index of words by letter count, counts[c][k] is the bitset of words
+        with at least k copies of letter code c
+        """
+        ids = [[[] for _ in range(self.wordlen + 1)] for _ in LETTERS]
+
+        for word_id, word in enumerate(self.words):
+            for c in set(word):
+                for k in range(1, word.count(c) + 1):
+                    ids[ord(c) - ord('a')][k].append(word_id)
+
+        every = self.all.bits
+        return [[every] + [ids_to_bits(k) for k in letter[1:]] for letter in ids]
+
+    def bits(self, words):
+        """
+        bitset of ids of the given words, unknown words are ignored
+        """
+        if isinstance(words, WordSet) and words.store is self:
+            return words.bits
+
+        ids = self.ids
+        return ids_to_bits(ids[word] for word in words if word in ids)
+
+    def subset(self, words):
+        """
+        convert words (a WordSet, a bitset or iterable of strings) to a WordSet
+        """
+        if isinstance(words, int):
+            return WordSet(self, words)
+
+        return WordSet(self, self.bits(words))
+
+
+class WordSet(collections.abc.Set):
+    """
+    a subset of a WordStore held as a bitset of word ids
+
+    behaves like a set of strings, iterates in id (alphabetical) order
+    """
+
+    def __init__(self, store, bits):
+        self.store  = store
+        self.bits   = bits
+        self._words = None # materialized on first iteration
+        self._ids   = None # listed on first use
+
+    def __iter__(self):
+        if self._words is None:
+            words = self.store.words
+            self._words = [words[i] for i in bit_ids(self.bits)]
+
+        return iter(self._words)
+
+    def __len__(self):
+        if self._words is not None:
+            return len(self._words)
+
+        return popcount(self.bits)
+
+    def __bool__(self):
+        return bool(self.bits)
+
+    def __contains__(self, word):
+        word_id = self.store.ids.get(word)
+        return word_id is not None and bool(self.bits >> word_id & 1)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {len(self)} of {len(self.store)} words>"
+
+    @property
+    def ids(self):
+        """
+        sorted list of word ids in this set
+        """
+        if self._ids is None:
+            self._ids = bit_ids(self.bits)
+
+        return self._ids
+
+    def _same_store(self, other):
+        return isinstance(other, WordSet) and other.store is self.store
+
+    def _from_iterable(self, words):
+        words = list(words)
+
+        if all(word in self.store for word in words):
+            return self.store.subset(words)
+
+        return set(words)
+
+    def __and__(self, other):
+        if self._same_store(other):
+            return WordSet(self.store, self.bits & other.bits)
+        return super().__and__(other)
+
+    def __or__(self, other):
+        if self._same_store(other):
+            return WordSet(self.store, self.bits | other.bits)
+        return super().__or__(other)
+
+    def __sub__(self, other):
+        if self._same_store(other):
+            return WordSet(self.store, self.bits & ~other.bits)
+        return super().__sub__(other)
+
+    def __le__(self, other):
+        if self._same_store(other):
+            return self.bits & ~other.bits == 0
+        return super().__le__(other)
+
+    def __eq__(self, other):
+        if self._same_store(other):
+            return self.bits == other.bits
+        return super().__eq__(other)
+
+    __hash__ = None
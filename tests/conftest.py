@@ -0,0 +1,31 @@
+import pathlib
+
+import pytest
+
+from lib.wordle import Wordle
+
+DICTIONARY = pathlib.Path(__file__).parent.parent / 'dictionary.txt'
+
+
+@pytest.fixture
+def dictpath(tmp_path):
+    """
+    every 10th word of the dictionary, small enough to brute force
+    """
+    words = DICTIONARY.read_text().splitlines()[::10]
+    path = tmp_path / 'dictionary.txt'
+    path.write_text('\n'.join(words) + '\n')
+    return path
+
+
+@pytest.fixture
+def wordle(dictpath):
+    return Wordle(dictpath, 5)
+
+
+@pytest.fixture
+def args(dictpath):
+    """
+    Solver arguments for the small dictionary
+    """
+    return {'dict': dictpath, 'wordlen': 5}
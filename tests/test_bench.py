@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from lib import bench
+from lib.solver import Solver
+
+
+@pytest.fixture
+def solver(args, monkeypatch):
+    solver = Solver(args)
+    monkeypatch.setattr(bench, '_solver', solver)
+    return solver
+
+
+def test_opener_floor_never_overshoots(solver):
+    answers = sorted(solver.words)
+
+    for opener in random.Random(14).sample(answers, 3):
+        floor = bench.OpenerFloor(solver.wordle, opener, answers)
+        rounds = {}
+        for word in answers:
+            solver.reset()
+            rounds[word] = solver.solve(word, [opener])
+        total = sum(rounds.values())
+
+        # far tighter than 2 rounds for every answer but the opener
+        assert floor.rounds > 2 * len(answers) - 1
+        solved = 0
+        for word in answers:
+            assert solved + floor.rounds <= total
+            floor.solved(word, rounds[word])
+            solved += rounds[word]
+        assert floor.rounds == 0
+
+        assert bench.evaluate_opener(opener, answers) == (opener, total / len(answers), max(rounds.values()), len(answers))
+        pruned = bench.evaluate_opener(opener, answers, total / len(answers) - 0.01)
+        assert pruned[1] is None and pruned[3] < len(answers)
+
+
+def test_checkpoint_refuses_other_options_or_answers(args, solver, tmp_path):
+    checkpoint = tmp_path / 'search.json'
+    answers = sorted(solver.words)[:20]
+
+    search = bench.OpenerSearch(bench.Bench(args, 1, solver), checkpoint)
+    search.answers = answers
+    search.save()
+
+    with pytest.raises(ValueError, match='different answers'):
+        bench.OpenerSearch(bench.Bench(args, 1, solver), checkpoint).run(answers[:5], answers[1:])
+
+    hard = Solver(dict(args, hard=True))
+    with pytest.raises(ValueError, match='different dictionary or solver options'):
+        bench.OpenerSearch(bench.Bench(args, 1, hard), checkpoint)
@@ -0,0 +1,65 @@
+import random
+
+from lib.constraint import Constraint
+
+
+def responses(wordle, answer, guesses):
+    return [(guess, wordle.splice_word(answer, guess)) for guess in guesses]
+
+
+def consistent(wordle, rounds):
+    """
+    brute force: the words that give the same response to every guess
+    """
+    return {
+        word for word in wordle.dictionary
+        if all(wordle.splice_word(word, guess) == resp for guess, resp in rounds)
+    }
+
+
+def test_update_matches_response_equivalence(wordle):
+    words = list(wordle.dictionary)
+    rng = random.Random(1)
+
+    for _ in range(40):
+        answer = rng.choice(words)
+        rounds = responses(wordle, answer, rng.sample(words, rng.randint(1, 3)))
+
+        constraint = Constraint(5)
+        for guess, resp in rounds:
+            constraint.update(guess, resp)
+
+        expected = consistent(wordle, rounds)
+        assert set(wordle.store.subset(constraint.filter(wordle.store))) == expected
+        assert {word for word in words if constraint.matches(word)} == expected
+
+
+def test_repeated_letters():
+    constraint = Constraint.from_response('catch', 'oeeee')
+    assert constraint.matches('hatch')
+    assert constraint.max_counts['c'] == 1 # the first c was out, so only one
+
+
+def test_hard_hints_allow_every_consistent_word(wordle):
+    words = list(wordle.dictionary)
+    rng = random.Random(2)
+
+    for _ in range(40):
+        answer = rng.choice(words)
+        rounds = responses(wordle, answer, rng.sample(words, 2))
+
+        hints = Constraint(5)
+        for guess, resp in rounds:
+            hints.update(guess, resp, hard=True)
+
+        allowed = set(wordle.store.subset(hints.filter(wordle.store)))
+        assert consistent(wordle, rounds) <= allowed
+
+
+def test_filter_within_bits(wordle):
+    store = wordle.store
+    constraint = Constraint.from_pattern('s', 5, 'e', 'r')
+    some = store.bits(list(store)[::3])
+
+    expected = {store[i] for i in range(len(store)) if some >> i & 1 and constraint.matches(store[i])}
+    assert set(store.subset(constraint.filter(store, some))) == expected
@@ -0,0 +1,65 @@
+import pytest
+
+from lib.solver import Solver
+from lib.wordle import Wordle
+from lib.decisions import DecisionCache, DecisionTree
+
+
+def test_cache_evicts_the_least_recently_used():
+    cache = DecisionCache(maxsize=2)
+    cache.put([('crane', 'ooooo')], 'a')
+    cache.put([('crane', 'ioooo')], 'b')
+
+    # touching a makes b the oldest
+    assert cache.get([('crane', 'ooooo')]) == 'a'
+    cache.put([('crane', 'eoooo')], 'c')
+
+    assert len(cache) == 2
+    assert cache.get([('crane', 'ioooo')]) is None
+    assert cache.get([('crane', 'ooooo')]) == 'a'
+    assert cache.get([('crane', 'eoooo')]) == 'c'
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert cache.hit_rate == 0.75
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses, cache.hit_rate) == (0, 0, 0, 0)
+
+
+def test_cache_of_size_zero_stores_nothing():
+    cache = DecisionCache(maxsize=0)
+    cache.put([], 'a')
+
+    assert cache.get([]) is None
+    assert (len(cache), cache.misses) == (0, 1)
+
+
+def test_tree_round_trip(args, tmp_path):
+    solver = Solver(args)
+    tree = DecisionTree.build(solver)
+    assert len(tree) >= len(solver.words)
+
+    path = tmp_path / 'tree.json'
+    tree.save(path)
+    loaded = DecisionTree.load(path, solver.wordle)
+    assert (loaded.root, loaded.meta) == (tree.root, tree.meta)
+
+    # following the tree gives the solver's own guesses
+    for answer in sorted(solver.words)[::40]:
+        solver.reset()
+        while (guess := loaded.get(solver.history)) != answer:
+            assert guess == solver.get_suggestions(1)[0][0]
+            solver.prune_words(guess, solver.wordle.check_word(answer, guess))
+
+
+def test_tree_load_refuses_another_mode_or_dictionary(args, tmp_path):
+    solver = Solver(args)
+    path = tmp_path / 'tree.json'
+    DecisionTree.build(solver).save(path)
+
+    with pytest.raises(ValueError, match='normal mode'):
+        DecisionTree.load(path, solver.wordle, hard=True)
+
+    other = tmp_path / 'other.txt'
+    other.write_text('\n'.join(sorted(solver.words)[1:]))
+    with pytest.raises(ValueError, match='different dictionary'):
+        DecisionTree.load(path, Wordle(other, 5))
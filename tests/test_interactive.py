@@ -0,0 +1,81 @@
+import re
+import types
+import random
+
+import pytest
+
+pytest.importorskip('urwid')
+pytest.importorskip('blinker')
+
+from lib import interactive
+
+
+def regex_match(words, pattern, excludes, includes):
+    """
+    the matching that interactive used to do, a regex per keystroke
+    """
+    return {
+        word for word in words
+        if re.match(pattern, word)
+        and not any(c in word for c in excludes)
+        and all(c in word for c in includes)
+    }
+
+
+@pytest.fixture
+def win(wordle, monkeypatch):
+    app = types.SimpleNamespace(store=wordle.store, args={'wordlen': 5, 'invisible': False}, loop=None)
+    monkeypatch.setattr(interactive, 'app', app, raising=False)
+    return interactive.WinMatches()
+
+
+def test_stack_narrowing_matches_regex(wordle, win):
+    dictionary = wordle.dictionary
+    rng = random.Random(5)
+    pattern, excludes, includes = '', set(), set()
+
+    for _ in range(500):
+        key = rng.choice(['backspace'] * 3 + list('aeinorst.') + ['!', '@'])
+
+        if key == 'backspace':
+            pattern = pattern[:-1]
+        elif key == '!':
+            excludes ^= {rng.choice('aeinorst')}
+        elif key == '@':
+            includes ^= {rng.choice('aeinorst')}
+        elif len(pattern) < 5:
+            pattern += key
+
+        state = (pattern, ''.join(sorted(excludes)), ''.join(sorted(includes)))
+        matches = win.pattern_match(dictionary, *state)
+        assert set(matches) == regex_match(dictionary, *state), state
+
+
+def test_stack_pops_back(wordle, win):
+    dictionary = wordle.dictionary
+    win.pattern_match(dictionary, 'st', '', '')
+    win.pattern_match(dictionary, 'sta', 'r', '')
+    win.pattern_match(dictionary, 'sta.', 'r', '') # nothing new, not pushed
+    assert [state for state, _bits in win.stack] == [('st', '', ''), ('sta', 'r', '')]
+
+    # backspace pops back to the result it refines
+    win.pattern_match(dictionary, 'st', 'r', '')
+    assert [state for state, _bits in win.stack] == [('st', '', ''), ('st', 'r', '')]
+
+    # nothing refines a looser state, it starts over from the dictionary
+    assert set(win.pattern_match(dictionary, 's', '', '')) == regex_match(dictionary, 's', '', '')
+    assert [state for state, _bits in win.stack] == [('s', '', '')]
+
+
+def test_same_words_keep_the_scroll_position(wordle, win, monkeypatch):
+    words = sorted(wordle.dictionary)
+    monkeypatch.setattr(interactive.signals.pattern, '_value', 's')
+    monkeypatch.setattr(interactive.signals.wordlist, '_value', [])
+    win.words = wordle.store.subset(words[:100])
+    win.walker.focus = 7
+
+    win.words = wordle.store.subset(words[:100])
+    assert win.walker.focus == 7
+
+    win.words = wordle.store.subset(words[:99])
+    assert win.walker.focus == 0
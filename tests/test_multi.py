@@ -0,0 +1,22 @@
+import pytest
+
+from lib.wordle import Wordle
+from lib.multi import MultiSolver
+
+
+def test_solves_every_board(dictpath, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    multi = MultiSolver(Wordle(dictpath, 5), 4)
+
+    words = sorted(multi.wordle.dictionary)[::50][:4]
+    rounds = multi.solve(words)
+    assert not multi.unsolved
+    assert rounds >= len(words) # a guess solves one board at most
+
+
+def test_refuses_a_large_dictionary_without_a_matrix(dictpath, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setattr(Wordle, 'MATRIX_LIMIT', 10)
+
+    with pytest.raises(ValueError, match='--matrix'):
+        MultiSolver(Wordle(dictpath, 5), 2)
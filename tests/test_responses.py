@@ -0,0 +1,97 @@
+import array
+import random
+
+import pytest
+
+from lib.wordle import Wordle
+from lib.responses import ResponseMatrix, response_code, typecode
+
+
+def test_response_code_matches_splice_word(wordle):
+    words = list(wordle.dictionary)
+    pairs = [('hatch', 'catch'), ('otter', 'tenet'), ('speed', 'eerie'), ('abbey', 'babes')]
+    pairs += [tuple(random.Random(i).sample(words, 2)) for i in range(2000)]
+
+    for word, guess in pairs:
+        code = response_code(word, guess)
+        assert Wordle.decode(code, 5) == wordle.splice_word(word, guess), (word, guess)
+
+
+def test_encode_is_the_inverse_of_decode():
+    for wordlen in (1, 3, 5):
+        for code, resp in enumerate(Wordle.responses(wordlen)):
+            assert Wordle.encode(resp) == code
+
+
+def test_matrix_rows_and_columns(wordle):
+    matrix = ResponseMatrix(wordle.dictionary, 5)
+    words = matrix.words[:20]
+
+    for guess_id, guess in enumerate(words):
+        row = matrix.row(guess_id)
+        for word_id, word in enumerate(words):
+            assert row[word_id] == response_code(word, guess)
+            assert matrix.column(word_id)[guess_id] == response_code(word, guess)
+
+
+def test_typecode_is_the_smallest_that_fits():
+    for wordlen in range(1, 21):
+        tc = typecode(wordlen)
+        itemsize = array.array(tc).itemsize
+
+        assert 3 ** wordlen <= 1 << (8 * itemsize)
+        assert itemsize == 1 or 3 ** wordlen > 1 << (4 * itemsize)
+
+
+def test_cache_replaces_a_stale_matrix(wordle, dictpath, tmp_path):
+    cachedir = tmp_path / 'cache'
+    words = list(wordle.dictionary)
+
+    ResponseMatrix.cached(words[:50], 5, cachedir, source=dictpath)
+    matrix = ResponseMatrix.cached(words[:60], 5, cachedir, source=dictpath)
+    assert len(matrix) == 60
+    assert len(list(cachedir.iterdir())) == 1
+
+    # a fresh cache file is memory mapped rather than rebuilt
+    cached = ResponseMatrix.cached(words[:60], 5, cachedir, build=False, source=dictpath)
+    assert isinstance(cached.codes, memoryview)
+    assert list(cached.codes) == list(matrix.codes)
+
+
+def test_require_matrix_builds_once_or_refuses(dictpath, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+
+    wordle = Wordle(dictpath, 5)
+    monkeypatch.setattr(wordle, 'MATRIX_LIMIT', len(wordle.dictionary) - 1)
+    with pytest.raises(ValueError, match='--matrix'):
+        wordle.require_matrix()
+
+    monkeypatch.setattr(wordle, 'MATRIX_LIMIT', len(wordle.dictionary))
+    assert len(wordle.require_matrix()) == len(wordle.dictionary)
+
+    # the next run finds it in the cache whatever the limit
+    wordle = Wordle(dictpath, 5)
+    monkeypatch.setattr(wordle, 'MATRIX_LIMIT', 0)
+    assert isinstance(wordle.require_matrix().codes, memoryview)
+
+
+@pytest.mark.parametrize('matrix', [False, True])
+def test_partition_matches_grouping_by_response(wordle, matrix):
+    if matrix:
+        wordle.matrix = ResponseMatrix(wordle.dictionary, 5)
+
+    words = list(wordle.dictionary)
+    rng = random.Random(20)
+    guesses = rng.sample(words, 10) + ['zzzzz']
+
+    for subset in (wordle.dictionary, wordle.store.subset(rng.sample(words, 30))):
+        partitions = list(wordle.bulk_partition(guesses, subset))
+        assert [guess for guess, _buckets in partitions] == guesses
+
+        for guess, buckets in partitions:
+            expected = {}
+            for word in subset:
+                expected.setdefault(Wordle.encode(wordle.splice_word(word, guess)), set()).add(word)
+
+            assert {code: set(words) for code, words in buckets.items()} == expected
+            assert wordle.partition(guess, subset) == buckets
@@ -0,0 +1,82 @@
+import pytest
+
+pytest.importorskip('click')
+pytest.importorskip('rich')
+
+import click
+
+from lib.reverseui import ReverserUI, BulkReverser
+
+
+def summary(wordle, answer, guesses):
+    emoji = {'o': '⬜', 'i': '🟨', 'e': '🟩'}
+    lines = [f"Wordle 123 {len(guesses) + 1}/6", ""]
+
+    for guess in guesses + [answer]:
+        lines.append(''.join(emoji[r] for r in wordle.splice_word(answer, guess)))
+
+    return '\n'.join(lines) + '\n'
+
+
+@pytest.fixture
+def rounds(wordle):
+    """
+    (answer, guesses) where the first and third guess get the same response
+    """
+    words = list(wordle.dictionary)
+
+    for answer in words:
+        by_resp = {}
+        for guess in words:
+            if guess != answer:
+                by_resp.setdefault(wordle.splice_word(answer, guess), []).append(guess)
+
+        same = next((g for g in by_resp.values() if len(g) >= 3), None)
+        other = next((g for g in by_resp.values() if len(g) >= 1 and g is not same), None)
+        if same and other:
+            return answer, [same[0], other[0], same[1]]
+
+
+def reverser(dictpath, tmp_path, text, word, guesses):
+    path = tmp_path / 'summary.txt'
+    path.write_text(text)
+    args = dict(dict=dictpath, wordlen=5, summary=path, word=word, guesses=guesses, hard=False, limit=0)
+    return ReverserUI(args)
+
+
+@pytest.mark.parametrize('pinned', [0, 1, 2, 3])
+def test_count_with_pinned_guesses(wordle, dictpath, tmp_path, rounds, pinned):
+    answer, guesses = rounds
+    app = reverser(dictpath, tmp_path, summary(wordle, answer, guesses), answer, guesses[:pinned])
+    rows = app.candidates()
+
+    if pinned:
+        assert app.count(rows) == sum(1 for _ in app.sequences(rows))
+    else:
+        assert app.count(rows) > 0
+
+    # repeating a pinned guess in a round with the same response is impossible
+    if pinned == 3:
+        app = reverser(dictpath, tmp_path, summary(wordle, answer, guesses), answer, [guesses[0], guesses[1], guesses[0]])
+        assert app.count(app.candidates()) == 0
+
+
+def test_too_many_guesses(wordle, dictpath, tmp_path, rounds):
+    answer, guesses = rounds
+    with pytest.raises(click.UsageError):
+        reverser(dictpath, tmp_path, summary(wordle, answer, guesses), answer, guesses + [answer, answer])
+
+
+def test_bulk_impossible_response(dictpath, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    app = BulkReverser(dict(dict=dictpath, wordlen=5, limit=3))
+
+    lines = [
+        "Wordle 301 3/6", "", "🟨⬜⬜⬜⬜", "🟩🟩🟩🟩🟨", "🟩🟩🟩🟩🟩", "",
+        "⬜⬜🟨⬜⬜", "🟩🟩🟩🟩🟩",
+    ]
+    app.run(lines)
+
+    out = capsys.readouterr().out
+    assert "wordle 301: 1 grid(s), 0 answers" in out
+    assert "grid 2: 1 grid(s)" in out
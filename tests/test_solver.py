@@ -0,0 +1,82 @@
+import random
+
+from lib.solver import Solver
+
+
+def stats(solver):
+    return (
+        solver._letter_counts,
+        solver._letter_pos,
+        solver._pair_counts,
+        solver._pair_total,
+        dict(solver._letter_dist),
+    )
+
+
+def test_incremental_stats_match_a_full_recount(args):
+    full = Solver(dict(args, stats=Solver.STATS_FULL))
+    incremental = Solver(dict(args, stats=Solver.STATS_INCREMENTAL))
+    words = list(full.words)
+    rng = random.Random(6)
+
+    for _ in range(10):
+        answer = rng.choice(words)
+        full.reset()
+        incremental.reset()
+
+        for guess in rng.sample(words, 3):
+            resp = full.wordle.check_word(answer, guess)
+            full.prune_words(guess, resp)
+            incremental.prune_words(guess, resp)
+
+            assert incremental.words == full.words
+            assert stats(incremental) == stats(full)
+
+
+def test_best_k_suggestions_are_the_head_of_the_full_sort(args):
+    solver = Solver(args)
+    answer = 'those' if 'those' in solver.words else min(solver.words)
+
+    for guess in ('crane', 'pilot'):
+        for k in (1, 5, 50):
+            assert solver.get_suggestions(k) == solver.get_suggestions()[:k]
+        solver.prune_words(guess, solver.wordle.check_word(answer, guess))
+
+
+def test_reset_restores_the_root_stats(args):
+    fresh = Solver(args)
+    solver = Solver(args)
+
+    for answer in ('those', 'crane'):
+        solver.reset()
+        for guess in ('pilot', 'ducky'):
+            solver.prune_words(guess, solver.wordle.check_word(answer, guess))
+
+    solver.reset()
+    assert solver.words == fresh.words
+    assert stats(solver) == stats(fresh)
+
+
+def test_hard_mode_guesses_use_every_hint(args):
+    solver = Solver(dict(args, hard=True, pool='dictionary'))
+    easy = Solver(dict(args, pool='dictionary'))
+    dictionary = list(solver.wordle.dictionary)
+    rng = random.Random(17)
+    rejected = 0
+
+    for answer in rng.sample(dictionary, 5):
+        solver.reset()
+        for guess in rng.sample(dictionary, 2):
+            solver.prune_words(guess, solver.wordle.check_word(answer, guess))
+
+        guesses = set(solver.strategy.guesses())
+        assert guesses == {word for word in dictionary if solver.hints.matches(word)}
+        assert set(solver.words) <= guesses
+        assert {word for word, _score in solver.get_suggestions(10)} <= guesses
+
+        for word in set(dictionary) - guesses:
+            assert not solver.valid_guess(word)
+            assert easy.valid_guess(word)
+            rejected += 1
+
+    assert rejected
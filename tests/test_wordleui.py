@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip('click')
+pytest.importorskip('rich')
+
+from lib.wordleui import WordleUI
+
+
+def play(monkeypatch, args, guesses, **options):
+    guesses = iter(guesses)
+    monkeypatch.setattr('builtins.input', lambda _prompt: next(guesses))
+
+    ui = WordleUI({**args, 'hard': False, 'absurd': False, 'start_word': None, **options})
+    ui.play()
+    return ui
+
+
+def test_hard_mode_refuses_a_guess_ignoring_hints(wordle, args, monkeypatch, capsys):
+    words = sorted(wordle.dictionary)
+    answer = words[0]
+    guess = next(w for w in words[1:] if w[0] == answer[0])
+    ignoring = next(w for w in words if answer[0] not in w)
+
+    ui = play(monkeypatch, args, [guess, ignoring, answer], hard=True, start_word=answer)
+    out = capsys.readouterr().out
+    assert "hard mode, your guess must use every hint" in out
+    assert [guess for guess, _resp in ui.rounds] == [guess, answer]
+
+    # the same guess is fine in normal mode
+    ui = play(monkeypatch, args, [guess, ignoring, answer], start_word=answer)
+    assert "hard mode" not in capsys.readouterr().out
+    assert len(ui.rounds) == 3
+
+
+def test_absurd_keeps_the_largest_bucket(wordle, args, monkeypatch):
+    guesses = []
+
+    def guess(_prompt):
+        # brute force what the adversary must answer to the first word left
+        words = list(ui.wordle.words)
+        buckets = {}
+        for word in words:
+            buckets.setdefault(wordle.splice_word(word, words[0]), set()).add(word)
+        guesses.append((words[0], set(words), buckets))
+        return words[0]
+
+    monkeypatch.setattr('builtins.input', guess)
+    ui = WordleUI({**args, 'hard': False, 'absurd': True, 'start_word': None})
+    ui.play()
+
+    assert len(ui.rounds) == len(guesses) > 1
+    for i, (word, resp) in enumerate(ui.rounds):
+        guessed, _words, buckets = guesses[i]
+        assert word == guessed
+        assert len(buckets[resp]) == max(len(words) for words in buckets.values())
+
+        # and the words left are exactly that bucket
+        if i + 1 < len(guesses):
+            assert guesses[i + 1][1] == buckets[resp]
+
+    word, resp = ui.rounds[-1]
+    assert resp == 'e' * 5 and ui.word == word
@@ -0,0 +1,38 @@
+import random
+
+from lib.utils import popcount, bit_ids, ids_to_bits
+
+
+def test_bit_helpers():
+    rng = random.Random(3)
+
+    for density in (0.001, 0.1, 0.9):
+        ids = sorted(i for i in range(5000) if rng.random() < density)
+        bits = ids_to_bits(ids)
+
+        assert bit_ids(bits) == ids
+        assert popcount(bits) == len(ids)
+
+    assert ids_to_bits([]) == 0
+    assert bit_ids(0) == []
+
+
+def test_wordset_behaves_like_a_set(wordle):
+    store = wordle.store
+    words = list(store)
+    rng = random.Random(4)
+
+    for _ in range(20):
+        a, b = set(rng.sample(words, 50)), set(rng.sample(words, 80))
+        x, y = store.subset(a), store.subset(b)
+
+        assert set(x) == a and len(x) == len(a)
+        assert list(x) == sorted(a)
+        assert set(x & y) == a & b
+        assert set(x | y) == a | b
+        assert set(x - y) == a - b
+        assert (x & y) <= x
+        assert (x <= y) == (a <= b)
+        assert x == store.subset(sorted(a))
+        assert all(word in x for word in a)
+        assert x.ids == sorted(store.ids[word] for word in a)